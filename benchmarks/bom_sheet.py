@@ -0,0 +1,78 @@
+"""
+Compare the ways of writing the BOM spreadsheet (create_bom.make_bom) for 1k and 10k rows:
+    - per cell: every cell set with Spreadsheet::Sheet.set()
+    - bulk: the cells imported from a temporary file in one call (sheet_writer.SheetWriter)
+
+Run it with FreeCAD's console interpreter, from the repository root:
+    freecadcmd benchmarks/bom_sheet.py
+
+No timings have been recorded with it yet: it measures the difference, the sources don't claim one.
+"""
+
+import os
+import sys
+import time
+
+import FreeCAD as App
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from freecad.frameforge import create_bom  # noqa: E402
+from freecad.frameforge.sheet_writer import SheetWriter  # noqa: E402
+
+SIZES = (1000, 10000)
+
+
+class PerCellWriter(SheetWriter):
+    def import_cells(self, sheet, cells):
+        return False
+
+
+def make_rows(count):
+    return [
+        {
+            "parent": f"Frame{i // 100}",
+            "label": f"Profile{i:05d}",
+            "family": "Square Hollow",
+            "size_name": "40x40x3",
+            "material": "S235",
+            "length": f"{500 + i % 1000:.1f}",
+            "cut_angle_1": "0.0",
+            "cut_angle_2": f"@ {45 + i % 10:.1f}",
+            "cutout": "Yes" if i % 7 == 0 else "",
+            "approx_weight": "1.8",
+            "price": "12.5",
+            "quantity": "1",
+        }
+        for i in range(count)
+    ]
+
+
+def timed_bom(doc, writer, rows, name):
+    create_bom.SheetWriter = writer
+    start = time.perf_counter()
+    create_bom.make_bom(rows, [], bom_name=name)
+    doc.recompute()
+    return time.perf_counter() - start, doc.getObject(name)
+
+
+def main():
+    doc = App.newDocument("BomSheetBenchmark")
+    App.setActiveDocument(doc.Name)
+
+    print(f"{'rows':>6} {'per cell (s)':>13} {'bulk (s)':>9} {'speed-up':>9} {'same cells':>11}")
+    for count in SIZES:
+        rows = make_rows(count)
+        t_cell, cell_sheet = timed_bom(doc, PerCellWriter, rows, f"PerCell{count}")
+        t_bulk, bulk_sheet = timed_bom(doc, SheetWriter, rows, f"Bulk{count}")
+
+        addresses = [f"{c}{r}" for r in (1, 2, 3, count // 2, count + 2, count + 6) for c in "ABFGHL"]
+        same = all(cell_sheet.getContents(a) == bulk_sheet.getContents(a) for a in addresses)
+        print(f"{count:>6} {t_cell:>13.3f} {t_bulk:>9.3f} {t_cell / t_bulk:>8.1f}x {str(same):>11}")
+
+    create_bom.SheetWriter = SheetWriter
+    App.closeDocument(doc.Name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare the trim boolean strategies on a member trimmed by 2 to 6 boundaries:
+    - fuse chain: the cut tools are fused pairwise, then the member is cut once by the result
+    - multi-tool: the member is cut once, with all the tools as arguments (cuts.trim_shape)
+
+Run it with FreeCAD's console interpreter, from the repository root:
+    freecadcmd benchmarks/trim_boolean.py
+
+No timings have been recorded with it yet: it measures the difference, the sources don't claim one.
+"""
+
+import os
+import sys
+import time
+
+import FreeCAD as App
+import Part
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from freecad.frameforge.cuts import trim_shape  # noqa: E402
+
+REPEAT = 5
+
+
+def make_member(length=1000.0, size=40.0, thickness=3.0):
+    outer = Part.makeBox(size, size, length, App.Vector(-size / 2, -size / 2, 0))
+    inner = Part.makeBox(
+        size - 2 * thickness, size - 2 * thickness, length, App.Vector(-size / 2 + thickness, -size / 2 + thickness, 0)
+    )
+    return outer.cut(inner)
+
+
+def make_boundaries(count, length=1000.0, size=40.0):
+    """Tubes crossing both ends of the member, turned around it."""
+    boundaries = []
+    for i in range(count):
+        z = -size / 2 if i % 2 == 0 else length - size / 2
+        tube = make_member(400.0, size)
+        tube.rotate(App.Vector(0, 0, 0), App.Vector(1, 0, 0), 90)
+        tube.rotate(App.Vector(0, 0, 0), App.Vector(0, 0, 1), 180.0 * i / count)
+        tube.translate(App.Vector(0, 0, z + size / 2))
+        boundaries.append(tube)
+    return boundaries
+
+
+def make_tools(count, length=1000.0):
+    """Boxes removing the ends of the member, tilted differently (as miters would be)."""
+    tools = []
+    for i in range(count):
+        z = 0.0 if i % 2 == 0 else length
+        box = Part.makeBox(200, 200, 100, App.Vector(-100, -100, -100 if i % 2 == 0 else 0))
+        box.translate(App.Vector(0, 0, z))
+        box.rotate(App.Vector(0, 0, z), App.Vector(1, 0, 0), 5.0 * i)
+        tools.append(box)
+    return tools
+
+
+def fuse_chain(body, cut_shapes):
+    cut_shape = cut_shapes[0]
+    for sh in cut_shapes[1:]:
+        cut_shape = cut_shape.fuse(sh)
+    return body.cut(cut_shape)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main():
+    body = make_member()
+    print(f"{'tools':>6} {'fuse chain (s)':>15} {'multi-tool (s)':>15} {'speed-up':>9} {'volume diff':>12}")
+    for count in range(2, 7):
+        boundaries = make_boundaries(count)
+        cut_shapes = make_tools(count)
+
+        t_chain, chain = timed(fuse_chain, body, cut_shapes)
+        t_multi, multi = timed(body.cut, cut_shapes)
+        print(
+            f"{count:>6} {t_chain:>15.4f} {t_multi:>15.4f} {t_chain / t_multi:>8.1f}x {abs(chain.Volume - multi.Volume):>12.2e}"
+        )
+
+        t_trim, _ = timed(trim_shape, body, boundaries)
+        print(f"{'':>6} trim_shape, Perfect fit with {count} boundaries: {t_trim:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
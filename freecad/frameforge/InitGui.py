@@ -186,6 +186,9 @@ class FrameForge(Gui.Workbench):
         "FrameForge_TrimProfiles",
         "FrameForge_EndMiter",
         "FrameForge_AddExtrudeCutout",
+        "FrameForge_AutoJoint",
+        "FrameForge_CheckClashes",
+        "FrameForge_ParallelRebuild",
     ]
 
     toolbox_group = ["Std_Group", "Std_Part"]
@@ -203,6 +206,8 @@ class FrameForge(Gui.Workbench):
         here is the place to import all the commands
         """
         from freecad.frameforge import (
+            auto_joint_tool,
+            check_clashes_tool,
             create_bom_tool,
             create_custom_profiles_tool,
             create_end_miter_tool,
@@ -211,6 +216,7 @@ class FrameForge(Gui.Workbench):
             create_profiles_tool,
             create_trimmed_profiles_tool,
             edit_profile_tool,
+            parallel_rebuild_tool,
             parametric_line,
         )
         from freecad.frameforge.ff_tools import translate
@@ -0,0 +1,277 @@
+import math
+import os
+import time
+from collections import defaultdict, namedtuple
+
+import FreeCAD as App
+import FreeCADGui as Gui
+import Part
+
+from freecad.frameforge.ff_tools import ICONPATH, translate
+from freecad.frameforge.joints import PRECISION
+from freecad.frameforge.spatial_index import get_index
+from freecad.frameforge.trimmed_profile import TrimmedProfile, ViewProviderTrimmedProfile
+
+# End of a member: its profile, the end (0: start, 1: end of the Target edge), the end position and the unit
+# direction going from the end into the member.
+MemberEnd = namedtuple("MemberEnd", ["profile", "index", "point", "direction"])
+
+# Joint found in the frame:
+#   L: two member ends meeting at an angle, mitered
+#   T: a member end on the side of a through member, trimmed by it (Perfect fit)
+#   X: more than two members meeting at the same point, reported only
+#   I: two collinear member ends (a splice), nothing to do
+#   O: two member ends going the same way (overlapping members), reported only: they can't be mitered
+Joint = namedtuple("Joint", ["kind", "ends", "through", "angle", "point"])
+
+# angle (degrees) under which two member ends are considered collinear
+COLLINEAR_ANGLE = 1.0
+
+
+def is_member(obj):
+    """Profiles built on an edge, the only ones whose ends are known."""
+    return obj.TypeId == "Part::FeaturePython" and hasattr(obj, "Family") and bool(getattr(obj, "Target", None))
+
+
+def target_edge(profile):
+    return profile.Target[0].getSubObject(profile.Target[1][0])
+
+
+def member_ends(profiles):
+    ends = []
+    for profile in profiles:
+        edge = target_edge(profile)
+        if not isinstance(edge.Curve, Part.Line):
+            continue
+
+        start, end = edge.Vertexes[0].Point, edge.Vertexes[-1].Point
+        if start.distanceToPoint(end) == 0:
+            continue
+
+        direction = (end - start).normalize()
+        ends.append(MemberEnd(profile, 0, start, direction))
+        ends.append(MemberEnd(profile, 1, end, -direction))
+
+    return ends
+
+
+def cell(point, size):
+    return (math.floor(point.x / size), math.floor(point.y / size), math.floor(point.z / size))
+
+
+def neighbour_cells(key):
+    x, y, z = key
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            for k in (-1, 0, 1):
+                yield (x + i, y + j, z + k)
+
+
+def group_ends(ends, tolerance):
+    """
+    Group the member ends closer than 'tolerance' in nodes, with a spatial hash of cell size 'tolerance': each
+    end is only compared to the ends of the neighbour cells.
+    """
+    grid = defaultdict(list)
+    for i, end in enumerate(ends):
+        grid[cell(end.point, tolerance)].append(i)
+
+    # union-find of the close ends
+    parent = list(range(len(ends)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, end in enumerate(ends):
+        for key in neighbour_cells(cell(end.point, tolerance)):
+            for j in grid.get(key, ()):
+                if j > i and end.point.distanceToPoint(ends[j].point) <= tolerance:
+                    parent[root(j)] = root(i)
+
+    nodes = defaultdict(list)
+    for i, end in enumerate(ends):
+        nodes[root(i)].append(end)
+
+    return list(nodes.values())
+
+
+def segment_distance(point, start, end):
+    """Distance from 'point' to the segment, and the position of its projection on the segment (0 to 1)."""
+    d = end - start
+    t = max(0.0, min(1.0, (point - start).dot(d) / d.dot(d)))
+    return point.distanceToPoint(start + d * t), t
+
+
+def find_through_member(end, ends_by_profile, index, tolerance, exclude=()):
+    """Return the member whose Target edge passes through 'end' (not at one of its ends), or None."""
+    bbox = App.BoundBox()
+    bbox.add(end.point)
+    for name in index.axes_overlapping(bbox, tolerance):
+        if name == end.profile.Name or name in exclude or name not in ends_by_profile:
+            continue
+
+        start, stop = ends_by_profile[name]
+        distance, t = segment_distance(end.point, start.point, stop.point)
+        length = start.point.distanceToPoint(stop.point)
+        if distance <= tolerance and tolerance < t * length < length - tolerance:
+            return start.profile
+
+    return None
+
+
+def member_angle(end1, end2):
+    return math.degrees(end1.direction.getAngle(end2.direction))
+
+
+def find_joints(profiles, tolerance):
+    """Classify the nodes of the frame made by the Target edges of 'profiles'."""
+    ends = member_ends(profiles)
+    ends_by_profile = defaultdict(list)
+    for end in ends:
+        ends_by_profile[end.profile.Name].append(end)
+
+    index = get_index(profiles[0].Document) if profiles else None
+    # the axes are read from the Target edges now, even if the members are not recomputed yet
+    for name, (start, stop) in ends_by_profile.items():
+        index.insert_axis(name, (start.point, stop.point))
+
+    joints = []
+    # the ends of a node must be the same point for the End Miter trims, whatever the tolerance of the T joints
+    for node in group_ends(ends, min(tolerance, PRECISION)):
+        # every end lying on the side of another member is trimmed by it, whatever the other ends of the node
+        members = {end.profile.Name for end in node}
+        for end in node:
+            through = find_through_member(end, ends_by_profile, index, tolerance, members)
+            if through is not None:
+                joints.append(Joint("T", [end], through, None, end.point))
+
+        if len(node) == 2:
+            angle = member_angle(*node)
+            if angle > 180 - COLLINEAR_ANGLE:
+                kind = "I"
+            elif angle < COLLINEAR_ANGLE:
+                kind = "O"
+            else:
+                kind = "L"
+            joints.append(Joint(kind, node, None, angle, node[0].point))
+
+        elif len(node) > 2:
+            joints.append(Joint("X", node, None, None, node[0].point))
+
+    return joints
+
+
+def trim_chain_tail(profile):
+    """Last trim of the chain built on 'profile' (or the profile itself), and the boundaries already used."""
+    tail = profile
+    boundaries = set()
+    while True:
+        trims = [o for o in tail.InList if hasattr(o, "TrimmedProfileType") and o.TrimmedBody == tail]
+        if not trims:
+            return tail, boundaries
+        tail = trims[0]
+        boundaries.update(link[0].Name for link in tail.TrimmingBoundary)
+
+
+def make_trim(doc, trimmed_body, boundary, kind):
+    suffix = "Mt" if kind == "End Miter" else "Tr"
+    trimmed_profile = doc.addObject("Part::FeaturePython", f"{trimmed_body.Name}_{suffix}")
+    if len(trimmed_body.Parents) > 0:
+        trimmed_body.Parents[-1][0].addObject(trimmed_profile)
+
+    TrimmedProfile(trimmed_profile)
+    ViewProviderTrimmedProfile(trimmed_profile.ViewObject)
+    trimmed_profile.TrimmedBody = trimmed_body
+    trimmed_profile.TrimmingBoundary = [(boundary, ())]
+    trimmed_profile.TrimmedProfileType = kind
+    if kind == "End Trim":
+        trimmed_profile.CutType = "Perfect fit"
+
+    return trimmed_profile
+
+
+def make_joints(doc, joints):
+    """
+    Create the trims of the L and T joints, after the existing trims of each member. Members already trimmed by
+    the other member of a joint are skipped. Returns the number of trims created.
+    """
+    tails = {}
+    created = 0
+
+    def add_trim(profile, boundary, kind):
+        nonlocal created
+        if profile.Name not in tails:
+            tails[profile.Name] = trim_chain_tail(profile)
+        tail, boundaries = tails[profile.Name]
+        if boundary.Name in boundaries:
+            return
+
+        tail = make_trim(doc, tail, boundary, kind)
+        boundaries.add(boundary.Name)
+        tails[profile.Name] = (tail, boundaries)
+        created += 1
+
+    for joint in joints:
+        if joint.kind == "L":
+            end1, end2 = joint.ends
+            add_trim(end1.profile, end2.profile, "End Miter")
+            add_trim(end2.profile, end1.profile, "End Miter")
+        elif joint.kind == "T":
+            add_trim(joint.ends[0].profile, joint.through, "End Trim")
+
+    return created
+
+
+def auto_joint(doc, tolerance):
+    start = time.perf_counter()
+    profiles = [obj for obj in doc.Objects if is_member(obj)]
+    joints = find_joints(profiles, tolerance)
+
+    doc.openTransaction("Auto joint")
+    try:
+        created = make_joints(doc, joints)
+    finally:
+        doc.commitTransaction()
+    doc.recompute()
+
+    for joint in joints:
+        if joint.kind == "X":
+            members = ", ".join(end.profile.Label for end in joint.ends)
+            App.Console.PrintWarning(f"FrameForge: joint of {members} at {joint.point} is not handled\n")
+        elif joint.kind == "O":
+            members = ", ".join(end.profile.Label for end in joint.ends)
+            App.Console.PrintWarning(f"FrameForge: {members} overlap at {joint.point}, they are not mitered\n")
+
+    counts = {kind: sum(1 for j in joints if j.kind == kind) for kind in "LTXIO"}
+    App.Console.PrintMessage(
+        f"FrameForge: {counts['L']} L, {counts['T']} T, {counts['X']} X joints, {counts['I']} splices and "
+        f"{counts['O']} overlaps found, {created} trims created, {time.perf_counter() - start:.2f}s\n"
+    )
+
+
+class AutoJointCommand:
+    def GetResources(self):
+        return {
+            "Pixmap": os.path.join(ICONPATH, "auto-joint.svg"),
+            "MenuText": translate("FrameForge", "Auto joint"),
+            "ToolTip": translate(
+                "FrameForge",
+                "<html><head/><body><p><b>Create the joints of the whole frame</b> \
+                    <br><br> \
+                    Profiles meeting at their ends are mitered, profiles ending on another one are trimmed by it. \
+                    </p></body></html>",
+            ),
+        }
+
+    def IsActive(self):
+        return bool(App.ActiveDocument)
+
+    def Activated(self):
+        param = App.ParamGet("User parameter:BaseApp/Preferences/Frameforge")
+        auto_joint(App.ActiveDocument, param.GetFloat("AutoJointTolerance", PRECISION))
+
+
+Gui.addCommand("FrameForge_AutoJoint", AutoJointCommand())
@@ -0,0 +1,174 @@
+import FreeCAD as App
+import Part
+
+vec = App.Base.Vector
+
+# tolerance used to sew the faces of the beveled solid together
+SEWING_TOLERANCE = 1e-4
+
+
+def bevel_normal(angle_y, angle_2, combined):
+    """
+    Return the unit normal of a bevel plane. The bevel is a rotation of the XY plane around Y by 'angle_y', then
+    around Z (combined bevels) or X by 'angle_2', angles in degrees.
+    """
+    rot = App.Rotation(vec(0, 0, 1) if combined else vec(1, 0, 0), angle_2).multiply(
+        App.Rotation(vec(0, 1, 0), angle_y)
+    )
+    return rot.multVec(vec(0, 0, 1))
+
+
+def make_beveled_solid(face, length, start_angles, end_angles, combined):
+    """
+    Extrude 'face' along Z by 'length' and cut both ends with the bevel planes defined by 'start_angles' and
+    'end_angles' (see bevel_normal). The solid is built directly from its faces; the historical boolean
+    construction is only used when the direct build fails.
+    """
+    start_normal = bevel_normal(*start_angles, combined)
+    end_normal = bevel_normal(*end_angles, combined)
+
+    if not (_is_flat(start_normal) and _is_flat(end_normal)) and any(
+        edge.isClosed() and not isinstance(edge.Curve, Part.Line) for edge in face.Edges
+    ):
+        # the traces of a closed curved edge on a bevel plane have no matching seams, the ruled surface would twist
+        return boolean_bevel(face, length, start_angles, end_angles, combined)
+
+    try:
+        solid = direct_bevel(face, length, start_normal, end_normal)
+    except Exception:
+        solid = None
+
+    if solid is None:
+        App.Console.PrintWarning("FrameForge: direct bevel construction failed, using boolean operations\n")
+        solid = boolean_bevel(face, length, start_angles, end_angles, combined)
+
+    return solid
+
+
+def direct_bevel(face, length, start_normal, end_normal):
+    """
+    Build the beveled solid from the section edges: the trace of every edge on the start and end planes, the
+    lateral face joining both traces and the two end faces. Straight edges are intersected analytically with the
+    planes, curved edges are sectioned. Closed curved edges are only supported between planes normal to Z, where
+    their traces are copies of the edge. Returns None if the result is not a valid solid.
+    """
+    margin = max(_plane_deviation(face.BoundBox, start_normal), _plane_deviation(face.BoundBox, end_normal)) + 1.0
+
+    faces = []
+    start_wires = []
+    end_wires = []
+    for wire in face.Wires:
+        start_edges = []
+        end_edges = []
+        for edge in wire.OrderedEdges:
+            if isinstance(edge.Curve, Part.Line):
+                a = edge.valueAt(edge.FirstParameter)
+                b = edge.valueAt(edge.LastParameter)
+                a0, b0 = _on_plane(a, start_normal, 0.0), _on_plane(b, start_normal, 0.0)
+                a1, b1 = _on_plane(a, end_normal, length), _on_plane(b, end_normal, length)
+
+                start_edges.append(Part.makeLine(a0, b0))
+                end_edges.append(Part.makeLine(a1, b1))
+                faces.append(Part.Face(Part.makePolygon([a0, b0, b1, a1, a0])))
+
+            elif edge.isClosed():
+                if not (_is_flat(start_normal) and _is_flat(end_normal)):
+                    return None
+
+                # copies of the edge: both traces start on the same seam and run the same way
+                start_trace = edge.copy()
+                end_trace = edge.translated(vec(0, 0, length))
+
+                start_edges.append(start_trace)
+                end_edges.append(end_trace)
+                faces.append(Part.makeRuledSurface(start_trace, end_trace))
+
+            else:
+                side = edge.translated(vec(0, 0, -margin)).extrude(vec(0, 0, length + 2 * margin))
+                start_trace = _single_edge(side.slice(start_normal, 0.0))
+                end_trace = _single_edge(side.slice(end_normal, end_normal.z * length))
+                if start_trace is None or end_trace is None:
+                    return None
+
+                # both traces must run in the same direction for the ruled surface to stay on the section edge
+                p0 = start_trace.valueAt(start_trace.FirstParameter)
+                q0 = end_trace.valueAt(end_trace.FirstParameter)
+                q1 = end_trace.valueAt(end_trace.LastParameter)
+                if _xy_distance(p0, q1) < _xy_distance(p0, q0):
+                    end_trace = end_trace.reversed()
+
+                start_edges.append(start_trace)
+                end_edges.append(end_trace)
+                faces.append(Part.makeRuledSurface(start_trace, end_trace))
+
+        start_wires.append(Part.Wire(start_edges))
+        end_wires.append(Part.Wire(end_edges))
+
+    faces.append(Part.makeFace(start_wires, "Part::FaceMakerBullseye"))
+    faces.append(Part.makeFace(end_wires, "Part::FaceMakerBullseye"))
+
+    shape = Part.Compound(faces)
+    shape.sewShape(SEWING_TOLERANCE)
+    if len(shape.Shells) != 1:
+        return None
+
+    solid = Part.Solid(shape.Shells[0])
+    if solid.Volume < 0:
+        solid.reverse()
+
+    if not solid.isValid() or solid.Volume <= 0:
+        return None
+
+    return solid
+
+
+def boolean_bevel(face, length, start_angles, end_angles, combined):
+    """Historical construction: extend the extrusion on both ends then cut it with two rotated boxes."""
+    bb = face.BoundBox
+    hc = 10 * max(bb.XLength, bb.YLength)
+    second_axis = vec(0, 0, 1) if combined else vec(1, 0, 0)
+
+    ProfileFull = face.extrude(vec(0, 0, length))
+
+    ProfileExt = ProfileFull.fuse(face.extrude(vec(0, 0, length + hc / 4)))
+    box = Part.makeBox(hc, hc, hc)
+    box.translate(vec(-hc / 2 + bb.Center.x, -hc / 2 + bb.Center.y, length))
+    pr = vec(0, 0, length)
+    box.rotate(pr, vec(0, 1, 0), end_angles[0])
+    box.rotate(pr, second_axis, end_angles[1])
+    ProfileCut = ProfileExt.cut(box)
+
+    ProfileExt = ProfileCut.fuse(face.extrude(vec(0, 0, -hc / 4)))
+    box = Part.makeBox(hc, hc, hc)
+    box.translate(vec(-hc / 2 + bb.Center.x, -hc / 2 + bb.Center.y, -hc))
+    pr = vec(0, 0, 0)
+    box.rotate(pr, vec(0, 1, 0), start_angles[0])
+    box.rotate(pr, second_axis, start_angles[1])
+    ProfileCut = ProfileExt.cut(box)
+
+    return ProfileCut.removeSplitter()
+
+
+def _on_plane(point, normal, z0):
+    """Project 'point' along Z onto the plane of 'normal' going through (0, 0, z0)."""
+    return vec(point.x, point.y, z0 - (normal.x * point.x + normal.y * point.y) / normal.z)
+
+
+def _is_flat(normal):
+    """True if the plane of 'normal' is normal to Z: no bevel."""
+    return abs(normal.x) < 1e-12 and abs(normal.y) < 1e-12
+
+
+def _plane_deviation(bb, normal):
+    """Largest Z distance between the plane of 'normal' through the origin and the XY plane, over the box."""
+    return max(abs((normal.x * x + normal.y * y) / normal.z) for x in (bb.XMin, bb.XMax) for y in (bb.YMin, bb.YMax))
+
+
+def _single_edge(wires):
+    if len(wires) != 1 or len(wires[0].Edges) != 1:
+        return None
+    return wires[0].Edges[0]
+
+
+def _xy_distance(a, b):
+    return ((a.x - b.x) ** 2 + (a.y - b.y) ** 2) ** 0.5
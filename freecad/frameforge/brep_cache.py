@@ -0,0 +1,194 @@
+import hashlib
+import os
+
+import FreeCAD as App
+import Part
+
+from freecad.frameforge.kernels import KERNELS
+
+# Persistent cache of the built shapes, shared between sessions. Entries are BREP files named after a digest of
+# the kernel inputs (content addressing), so an entry never has to be invalidated: changed inputs give another
+# key. Least recently used entries are removed when the directory grows above the size cap.
+
+# bump when a kernel changes the shape it builds for the same inputs
+CACHE_VERSION = 1
+
+# inputs are rounded to this number of digits before hashing
+DIGITS = 6
+
+
+def shape_digest(shape, digits=DIGITS):
+    """Geometric fingerprint of a shape: topology counts, measures and rounded vertex positions."""
+    if shape is None or shape.isNull():
+        return "null"
+
+    bb = shape.BoundBox
+    data = (
+        shape.ShapeType,
+        len(shape.Solids),
+        len(shape.Faces),
+        len(shape.Edges),
+        len(shape.Vertexes),
+        _round(shape.Volume, digits),
+        _round(shape.Area, digits),
+        _round(shape.Length, digits),
+        tuple(_round(v, digits) for v in (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)),
+        tuple(sorted(tuple(_round(c, digits) for c in v.Point) for v in shape.Vertexes)),
+    )
+    return hashlib.sha1(repr(data).encode()).hexdigest()
+
+
+def input_digest(kind, inputs, digits=DIGITS):
+    """Key of the shape built by the kernel 'kind' from 'inputs'."""
+    data = (CACHE_VERSION, kind, _normalize(inputs, digits))
+    return hashlib.sha1(repr(data).encode()).hexdigest()
+
+
+def _round(value, digits):
+    # + 0.0 turns -0.0 into 0.0
+    return round(value, digits) + 0.0
+
+
+def _normalize(value, digits):
+    if isinstance(value, Part.Shape):
+        return ("shape", shape_digest(value, digits))
+    if isinstance(value, App.Vector):
+        return tuple(_round(c, digits) for c in value)
+    if isinstance(value, float):
+        return _round(value, digits)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v, digits)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v, digits) for v in value)
+
+    return value
+
+
+class BrepCache(object):
+    """Directory of BREP files with a size cap and least recently used eviction (based on the files mtime)."""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".brep")
+
+    def _entries(self):
+        if not os.path.isdir(self.path):
+            return []
+
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.is_file() and entry.name.endswith(".brep"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def get(self, key):
+        filename = self._file(key)
+        if not os.path.isfile(filename):
+            self.misses += 1
+            return None
+
+        try:
+            shape = Part.Shape()
+            shape.read(filename)
+            os.utime(filename)  # most recently used
+        except Exception:
+            # unreadable entry, build it again
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return shape
+
+    def put(self, key, shape):
+        if shape is None or shape.isNull():
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        filename = self._file(key)
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        try:
+            shape.exportBrep(tmp)
+            os.replace(tmp, filename)
+            added = os.path.getsize(filename)
+        except Exception as e:
+            App.Console.PrintWarning(f"FrameForge: can't write the shape cache ({e})\n")
+            return
+
+        self._size = self.size() + added
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache uses less than 90% of its cap."""
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, filename in entries:
+            if size <= 0.9 * self.max_bytes:
+                break
+            try:
+                os.remove(filename)
+                size -= entry_size
+            except OSError:
+                pass
+        self._size = size
+
+    def clear(self):
+        for _, _, filename in self._entries():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": self.size(), "max_bytes": self.max_bytes}
+
+
+_cache = None
+
+
+def get_cache():
+    """Return the document independent cache, or None if disabled in the preferences."""
+    global _cache
+
+    param = App.ParamGet("User parameter:BaseApp/Preferences/Frameforge")
+    if not param.GetBool("BrepCacheEnabled", True):
+        return None
+
+    max_bytes = param.GetInt("BrepCacheSizeMB", 512) * 1024 * 1024
+    if _cache is None:
+        _cache = BrepCache(os.path.join(App.getUserCachePath(), "frameforge"), max_bytes)
+    _cache.max_bytes = max_bytes
+
+    return _cache
+
+
+def cached_build(kind, inputs, key=None):
+    """Build the shape of the kernel 'kind' from 'inputs', or read it from the cache. 'key' is the input_digest if
+    already known."""
+    cache = get_cache()
+    if cache is None:
+        return KERNELS[kind](**inputs)
+
+    if key is None:
+        key = input_digest(kind, inputs)
+    shape = cache.get(key)
+    if shape is None:
+        shape = KERNELS[kind](**inputs)
+        cache.put(key, shape)
+
+    return shape
@@ -0,0 +1,205 @@
+import os
+import time
+from collections import namedtuple
+
+import FreeCAD as App
+import FreeCADGui as Gui
+
+from freecad.frameforge.ff_tools import ICONPATH, translate
+from freecad.frameforge.kernels import is_frameforge_feature, pack, run_clash_task
+from freecad.frameforge.parallel_rebuild_tool import make_pool
+from freecad.frameforge.sheet_writer import SheetWriter
+
+# pairs of members sent to a worker at once
+CHUNK_SIZE = 64
+
+# Shape of the frame checked for clashes: a FrameForge feature, or one body of a cutout of several bodies
+#   name: unique name, the feature name followed by the body index for a cutout body
+#   base: the object at the bottom of its trim and cutout chain
+Member = namedtuple("Member", ["name", "label", "shape", "base"])
+
+
+def base_member(obj):
+    """The object at the bottom of the trim and cutout chain of 'obj'."""
+    while True:
+        if hasattr(obj, "TrimmedBody") and obj.TrimmedBody is not None:
+            obj = obj.TrimmedBody
+        elif getattr(obj, "baseObject", None):
+            obj = obj.baseObject[0]
+        else:
+            return obj
+
+
+def final_members(doc):
+    """
+    Members of the FrameForge features that are not trimmed or cut by another one: the shapes of the frame. A cutout
+    of several bodies gives a member per body.
+    """
+    features = [obj for obj in doc.Objects if is_frameforge_feature(obj)]
+    inputs = set()
+    for obj in features:
+        if getattr(obj, "TrimmedBody", None) is not None:
+            inputs.add(obj.TrimmedBody.Name)
+        if getattr(obj, "baseObject", None):
+            inputs.add(obj.baseObject[0].Name)
+        inputs.update(body.Name for body in getattr(obj, "Bodies", None) or [])
+
+    members = []
+    for obj in features:
+        if obj.Name in inputs or obj.Shape.isNull():
+            continue
+
+        bodies = obj.Proxy.get_bodies(obj) if hasattr(obj.Proxy, "get_bodies") else []
+        if len(bodies) > 1:
+            # the shape of a cutout of several bodies is the compound of the cut bodies
+            for i, (body, shape) in enumerate(zip(bodies, obj.Shape.childShapes())):
+                members.append(Member(f"{obj.Name}.{i}", f"{obj.Label} ({body.Label})", shape, base_member(body)))
+        else:
+            members.append(Member(obj.Name, obj.Label, obj.Shape, base_member(obj)))
+
+    return members
+
+
+def jointed_pairs(doc):
+    """Pairs of base members trimmed by each other: they touch on purpose."""
+    pairs = set()
+    for obj in doc.Objects:
+        if not hasattr(obj, "TrimmingBoundary") or obj.TrimmedBody is None:
+            continue
+        base = base_member(obj).Name
+        for link in obj.TrimmingBoundary:
+            pairs.add(frozenset((base, base_member(link[0]).Name)))
+
+    return pairs
+
+
+def sweep_pairs(members):
+    """
+    Broad phase: pairs of members whose bounding boxes overlap, by sort and sweep along X. Only the members whose
+    X range is still open are compared on Y and Z.
+    """
+    boxes = sorted(((member.shape.BoundBox, member) for member in members), key=lambda item: item[0].XMin)
+
+    pairs = []
+    active = []
+    for bbox, obj in boxes:
+        active = [(b, o) for b, o in active if b.XMax >= bbox.XMin]
+        for other_bbox, other in active:
+            if (
+                other_bbox.YMin <= bbox.YMax
+                and bbox.YMin <= other_bbox.YMax
+                and other_bbox.ZMin <= bbox.ZMax
+                and bbox.ZMin <= other_bbox.ZMax
+            ):
+                pairs.append((other, obj))
+        active.append((bbox, obj))
+
+    return pairs
+
+
+def common_volumes(pairs):
+    """Narrow phase: common volume of the shapes of each pair, computed in a process pool when possible."""
+    chunks = [pairs[i : i + CHUNK_SIZE] for i in range(0, len(pairs), CHUNK_SIZE)]
+    tasks = []
+    for chunk in chunks:
+        shapes = {}
+        for a, b in chunk:
+            shapes[a.name] = a.shape
+            shapes[b.name] = b.shape
+        tasks.append(([(a.name, b.name) for a, b in chunk], shapes))
+
+    pool, workers = make_pool(len(tasks))
+    try:
+        if pool is not None:
+            results = pool.map(run_clash_task, [(names, pack(shapes)) for names, shapes in tasks])
+        else:
+            results = [run_clash_task(task) for task in tasks]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return [result for chunk in results for result in chunk], workers
+
+
+def write_report(doc, clashes, name="Clashes"):
+    sheet = doc.getObject(name)
+    if sheet is None or sheet.TypeId != "Spreadsheet::Sheet":
+        sheet = doc.addObject("Spreadsheet::Sheet", name)
+    else:
+        sheet.clearAll()
+
+    cells = SheetWriter()
+    cells.set("A1", "Clashes")
+    cells.set("A2", "Member A")
+    cells.set("B2", "Member B")
+    cells.set("C2", "Volume (mm3)")
+
+    row = 3
+    for a, b, volume in clashes:
+        cells.set("A" + str(row), a.label)
+        cells.set("B" + str(row), b.label)
+        cells.set("C" + str(row), f"{volume:.3f}")
+        row += 1
+    cells.write(sheet)
+
+    doc.recompute()
+    return sheet
+
+
+def check_clashes(doc, min_volume):
+    start = time.perf_counter()
+
+    members = final_members(doc)
+    jointed = jointed_pairs(doc)
+    pairs = []
+    for a, b in sweep_pairs(members):
+        bases = frozenset((a.base.Name, b.base.Name))
+        # members built on the same profile, or joined by a trim, touch on purpose
+        if len(bases) == 2 and bases not in jointed:
+            pairs.append((a, b))
+
+    results, workers = common_volumes(pairs)
+
+    by_name = {member.name: member for member in members}
+    clashes = []
+    for a, b, volume, error in results:
+        if error is not None:
+            App.Console.PrintError(f"FrameForge: can't check {by_name[a].label} and {by_name[b].label}: {error}\n")
+        elif volume > min_volume:
+            clashes.append((by_name[a], by_name[b], volume))
+    clashes.sort(key=lambda clash: -clash[2])
+
+    write_report(doc, clashes)
+
+    App.Console.PrintMessage(
+        f"FrameForge: {len(clashes)} clashes in {len(members)} members ({len(pairs)} pairs checked "
+        f"with {workers} process(es)), {time.perf_counter() - start:.2f}s\n"
+    )
+    return clashes
+
+
+class CheckClashesCommand:
+    def GetResources(self):
+        return {
+            "Pixmap": os.path.join(ICONPATH, "overlap.svg"),
+            "MenuText": translate("FrameForge", "Check clashes"),
+            "ToolTip": translate(
+                "FrameForge",
+                "<html><head/><body><p><b>Find the overlapping members of the frame</b> \
+                    <br><br> \
+                    Members joined by a trim are not checked against each other. \
+                    The clashes are listed in the Clashes spreadsheet. \
+                    </p></body></html>",
+            ),
+        }
+
+    def IsActive(self):
+        return bool(App.ActiveDocument)
+
+    def Activated(self):
+        param = App.ParamGet("User parameter:BaseApp/Preferences/Frameforge")
+        check_clashes(App.ActiveDocument, param.GetFloat("ClashMinVolume", 0.01))
+
+
+Gui.addCommand("FrameForge_CheckClashes", CheckClashesCommand())
@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import Part
+
+# Tube cope (fish mouth) of a round member ending on another round member. The cut itself is exact (cylinder of
+# the through member and half-space beyond its axis, see cuts.trim_shape); the intersection curve of the two
+# cylinders is computed in closed form here, to unroll it as a cutting template wrapped around the coped tube.
+
+TEMPLATE_SAMPLES = 361
+
+
+def largest_cylinder(shape):
+    """Return the cylindrical surface of 'shape' with the largest radius (the outside of a tube), or None."""
+    cylinders = [face.Surface for face in shape.Faces if isinstance(face.Surface, Part.Cylinder)]
+    if not cylinders:
+        return None
+
+    return max(cylinders, key=lambda c: c.Radius)
+
+
+def axes_angle(axis1, axis2):
+    """Angle (degrees, 0 to 90) between two axes."""
+    angle = math.degrees(axis1.getAngle(axis2))
+    return min(angle, 180.0 - angle)
+
+
+def cope_curve(r, R, angle, samples=TEMPLATE_SAMPLES):
+    """
+    Intersection of a tube of radius 'r' with a tube of radius 'R' whose axis crosses its own at 'angle' (degrees).
+    Returns a (samples, 2) array: developed length around the coped tube (0 to 2 pi r) and length along its axis,
+    from the shortest point of the cope.
+
+    With the coped tube axis along z and the other axis in the xz plane through the origin, a point
+    (r cos t, r sin t, z) lies on the other tube when (x cos a - z sin a)^2 + y^2 = R^2.
+    """
+    if r > R:
+        raise ValueError(f"A tube of radius {r:g} can't be coped on a tube of radius {R:g}")
+    if angle <= 0:
+        raise ValueError("The tubes are parallel")
+
+    a = math.radians(angle)
+    t = np.linspace(0.0, 2 * math.pi, samples)
+    x = r * np.cos(t)
+    y = r * np.sin(t)
+
+    # near side of the other tube
+    z = (x * math.cos(a) - np.sqrt(R * R - y * y)) / math.sin(a)
+
+    return np.column_stack((r * t, z - z.min()))
+
+
+def template_svg(points):
+    width, height = points[:, 0].max(), points[:, 1].max()
+    # the template is drawn with the cope at the top, the tube body below it
+    coords = " ".join(f"{x:.3f},{height - y:.3f}" for x, y in points.tolist())
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.3f}mm" height="{height + 10:.3f}mm" '
+        f'viewBox="0 0 {width:.3f} {height + 10:.3f}">\n'
+        f'  <polyline points="{coords}" style="fill:none;stroke:#000000;stroke-width:0.2" />\n'
+        f'  <path d="M 0,0 V {height + 10:.3f} M {width:.3f},0 V {height + 10:.3f}" '
+        'style="fill:none;stroke:#000000;stroke-width:0.1;stroke-dasharray:1,1" />\n'
+        "</svg>\n"
+    )
+
+
+def template_dxf(points):
+    """Minimal DXF (R12) with the cope curve as lines."""
+    lines = ["0", "SECTION", "2", "ENTITIES"]
+    for (x1, y1), (x2, y2) in zip(points[:-1].tolist(), points[1:].tolist()):
+        lines += ["0", "LINE", "8", "0", "10", f"{x1:.4f}", "20", f"{y1:.4f}", "11", f"{x2:.4f}", "21", f"{y2:.4f}"]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    return "\n".join(lines) + "\n"
+
+
+def export_template(path, r, R, angle):
+    """Write the unrolled cope template, as SVG or DXF according to the extension of 'path'."""
+    points = cope_curve(r, R, angle)
+    content = template_dxf(points) if path.lower().endswith(".dxf") else template_svg(points)
+    with open(path, "w") as fd:
+        fd.write(content)
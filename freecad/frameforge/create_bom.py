@@ -1,12 +1,18 @@
 import math
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from itertools import groupby
 
 import Assembly
 import FreeCAD
 import FreeCADGui as Gui
+import numpy as np
 import Part
 
+from freecad.frameforge.bevels import bevel_normal
+from freecad.frameforge.joints import miter_joint
+from freecad.frameforge.sections import SectionParams, make_section_face
+from freecad.frameforge.sheet_writer import SheetWriter
+
 
 def is_fusion(obj):
     if obj.TypeId == "Part::MultiFuse":
@@ -53,59 +59,25 @@ def is_part_or_part_design(obj):
     return obj.TypeId.startswith(("Part::", "PartDesign::")) and obj.TypeId != "Part::FeaturePython"
 
 
-def get_profile_from_trimmedbody(obj):
-    if is_trimmedbody(obj):
-        return get_profile_from_trimmedbody(obj.TrimmedBody)
-    else:
-        return obj
-
-
-def get_profile_from_extrudedcutout(obj):
-    if is_extrudedcutout(obj):
-        bo = obj.baseObject[0]
-        if is_profile(bo):
-            return bo
-        elif is_trimmedbody(bo):
-            return get_profile_from_trimmedbody(bo)
-        elif is_extrudedcutout(bo):
-            return get_profile_from_extrudedcutout(bo)
-        else:
-            return None
-
-    else:
-        raise Exception("Not an extruded cutout")
-
-
-def get_trimmedprofile_from_extrudedcutout(obj):
-    if is_extrudedcutout(obj):
-        bo = obj.baseObject[0]
-        if is_trimmedbody(bo):
-            return bo
-        elif is_extrudedcutout(bo):
-            return get_trimmedprofile_from_extrudedcutout(bo)
-        else:
-            return None
-    else:
-        raise Exception("Not an extruded cutout")
-
+def get_extrudedcutout_bodies(obj):
+    """Bodies cut by an extruded cutout: its base object, then its other Bodies."""
+    bodies = [obj.baseObject[0]]
+    bodies += [b for b in getattr(obj, "Bodies", []) if b not in bodies]
+    return bodies
 
-def get_all_cutting_angles(trimmed_profile):
-    """Retourne récursivement la liste des angles de coupe (en degrés)
-    d'un TrimmedProfile, y compris ceux de ses parents/enfants imbriqués."""
-    doc = FreeCAD.ActiveDocument
 
+def get_cutting_angles(trimmed_profile, resolve_edge):
+    """Angles de coupe (en degrés) du TrimmedProfile seul. 'resolve_edge' retourne l'arête Target d'un lien."""
     angles = []
 
-    def resolve_edge(link):
-        target = trimmed_profile.Proxy.getTarget(link)
-        return doc.getObject(target[0].Name).getSubObject(target[1][0])
-
     edge = resolve_edge(trimmed_profile.TrimmedBody)
     dir_vec = (edge.Vertexes[-1].Point.sub(edge.Vertexes[0].Point)).normalize()
 
-    angle_div = 2.0 if trimmed_profile.TrimmedProfileType == "End Miter" else 1.0
-
-    if trimmed_profile.TrimmedProfileType == "End Miter" or trimmed_profile.CutType == "Simple fit":
+    if trimmed_profile.TrimmedProfileType == "End Miter":
+        # shared with the miter trims, see joints.py
+        for bound in trimmed_profile.TrimmingBoundary:
+            angles.append(miter_joint(edge, resolve_edge(bound[0])).cut_angle)
+    elif trimmed_profile.CutType == "Simple fit":
         for bound in trimmed_profile.TrimmingBoundary:
             for sub in bound[1]:  # sous-objets (souvent "FaceX")
                 face = bound[0].getSubObject(sub)
@@ -116,31 +88,122 @@ def get_all_cutting_angles(trimmed_profile):
                     if angle > 90:
                         angle = 180 - angle
 
-                    angles.append(angle / angle_div)
+                    angles.append(angle)
     else:
         angles = ["?", "?"]
 
-    if hasattr(trimmed_profile.TrimmedBody, "TrimmedProfileType"):
-        parent_profile = trimmed_profile.TrimmedBody
-        angles.extend(get_all_cutting_angles(parent_profile))
-
     return angles
 
 
-def length_along_normal(obj):
+def get_all_cutting_angles(trimmed_profile):
+    """Retourne la liste des angles de coupe (en degrés)
+    d'un TrimmedProfile, y compris ceux de ses parents/enfants imbriqués."""
+    return BomCollector().cutting_angles(trimmed_profile)
+
+
+# flèche de la discrétisation des arêtes courbes des sections, en mm
+OUTLINE_DEFLECTION = 0.01
+
+
+def member_length(obj):
+    """
+    Longueur de barre d'un profil ou d'un TrimmedProfile, calculée depuis sa définition : les droites des points du
+    contour de la section le long du profil, limitées par les biseaux puis par les plans des coupes (Simple fit,
+    End Miter).
+    Retourne None pour les coupes non planes (Perfect fit, Tube cope) ou si la base n'est pas un profil FrameForge.
+    """
+    planes = []
+    prof = obj
+    while is_trimmedbody(prof):
+        tools = prof.Proxy.get_cut_tools(prof)
+        if tools["boundaries"] or tools.get("copes"):
+            return None
+        for face in tools["faces"]:
+            planes.append((face.Surface.Position, face.Surface.Axis))
+        for point, direction, normal, bisect in tools["miter_planes"]:
+            # same plane as cuts.trim_shape
+            planes.append((point, FreeCAD.Rotation(normal, -90 + bisect).multVec(direction)))
+        prof = prof.TrimmedBody
+
+    if not is_profile(prof) or not hasattr(prof.Proxy, "get_build_inputs"):
+        return None
+
+    inputs = prof.Proxy.get_build_inputs(prof)
+    section = inputs["section"]
+    face = make_section_face(section) if isinstance(section, SectionParams) else section
+    start_normal = bevel_normal(*inputs["start_angles"], inputs["combined"])
+    end_normal = bevel_normal(*inputs["end_angles"], inputs["combined"])
+    length = inputs["length"]
+
+    # points du contour de la section : les extrémités le long des normales des plans sont atteintes sur le contour,
+    # les arêtes courbes sont discrétisées (un cercle n'a pas de coins)
+    outline = [v.Point for v in face.Vertexes]
+    for edge in face.Edges:
+        outline += edge.discretize(Deflection=OUTLINE_DEFLECTION)
+    xy = np.array([(p.x, p.y) for p in outline])
+    x, y = xy[:, 0], xy[:, 1]
+
+    t0 = -(start_normal.x * x + start_normal.y * y) / start_normal.z
+    t1 = length - (end_normal.x * x + end_normal.y * y) / end_normal.z
+
+    # the profile is extruded along the Z axis of its placement
+    placement = prof.Placement
+    axis = placement.Rotation.multVec(FreeCAD.Vector(0, 0, 1))
+    bbox = face.BoundBox
+    center = placement.multVec(FreeCAD.Vector(bbox.Center.x, bbox.Center.y, length / 2))
+    u = np.array(tuple(placement.Rotation.multVec(FreeCAD.Vector(1, 0, 0))))
+    v = np.array(tuple(placement.Rotation.multVec(FreeCAD.Vector(0, 1, 0))))
+    origins = np.array(tuple(placement.Base)) + np.outer(x, u) + np.outer(y, v)
+
+    for point, normal in planes:
+        # the trim keeps the side of the plane holding the body
+        n = np.array(tuple(normal))
+        f0, k = origins @ n - point.dot(normal), axis.dot(normal)
+        if (center - point).dot(normal) < 0:
+            f0, k = -f0, -k
+
+        if abs(k) < 1e-12:
+            t1 = np.where(f0 < 0, -np.inf, t1)
+        elif k > 0:
+            t0 = np.maximum(t0, -f0 / k)
+        else:
+            t1 = np.minimum(t1, -f0 / k)
+
+    kept = t0 < t1
+    if not kept.any():
+        return 0.0
+
+    return float(t1[kept].max() - t0[kept].min())
+
+
+def length_along_normal(obj, edge=None):
     """
     Calcule la longueur de l'objet le long d'un vecteur normal.
 
     obj    : objet FreeCAD
-    normal : FreeCAD.Vector (doit être normalisé)
+    edge   : arête Target du profil, ou fonction la retournant, utilisée seulement pour la projection ; résolue
+             depuis obj si absente
+
+    La longueur est calculée depuis la définition du profil quand c'est possible (voir member_length), sinon en
+    projetant les sommets de la forme sur l'axe du profil.
     """
     doc = FreeCAD.ActiveDocument
 
-    if is_profile(obj):
+    try:
+        length = member_length(obj) if is_profile(obj) or is_trimmedbody(obj) else None
+    except (ValueError, RuntimeError):
+        length = None
+    if length is not None:
+        return length
+
+    if callable(edge):
+        edge = edge()
+
+    if edge is None and is_profile(obj):
         target = obj.Target
         edge = doc.getObject(target[0].Name).getSubObject(target[1][0])
 
-    elif is_trimmedbody(obj):
+    elif edge is None and is_trimmedbody(obj):
 
         def resolve_edge(link):
             target = obj.Proxy.getTarget(link)
@@ -148,18 +211,16 @@ def length_along_normal(obj):
 
         edge = resolve_edge(obj.TrimmedBody)
 
-    else:
+    elif edge is None:
         return 0.0
 
     dir_vec = (edge.Vertexes[-1].Point.sub(edge.Vertexes[0].Point)).normalize()
     n = dir_vec.normalize()
 
-    vertices = obj.Shape.Vertexes
-
-    projections = [v.Point.dot(n) for v in vertices]
+    points = np.array([tuple(v.Point) for v in obj.Shape.Vertexes])
+    projections = points @ np.array(tuple(n))
 
-    length = max(projections) - min(projections)
-    return length
+    return float(projections.max() - projections.min())
 
 
 def get_readable_cutting_angles(bsc1, bsc2, bec1, bec2, *trim_cuts):
@@ -202,43 +263,89 @@ def get_readable_cutting_angles(bsc1, bsc2, bec1, bec2, *trim_cuts):
     return ("?", "?")
 
 
-def traverse_assembly(profiles_data, links_data, obj, parent="", full_parent_path=False):
-    p = {}
-    if is_fusion(obj):
-        for child in obj.Shapes:
-            traverse_assembly(
-                profiles_data,
-                links_data,
-                child,
-                parent=(f"{parent} / " if full_parent_path else "") + obj.Label,
-                full_parent_path=full_parent_path,
-            )
-
-    elif is_group(obj):
-        for child in obj.Group:
-            traverse_assembly(
-                profiles_data,
-                links_data,
-                child,
-                parent=(f"{parent} / " if full_parent_path else "") + obj.Label,
-                full_parent_path=full_parent_path,
-            )
-
-    elif is_part(obj):
-        for child in obj.Group:
+# lines of the BOM
+ProfileRecord = namedtuple(
+    "ProfileRecord",
+    [
+        "parent",
+        "label",
+        "family",
+        "size_name",
+        "material",
+        "length",
+        "cut_angle_1",
+        "cut_angle_2",
+        "cutout",
+        "approx_weight",
+        "price",
+        "quantity",
+    ],
+)
+LinkRecord = namedtuple("LinkRecord", ["parent", "label", "part", "quantity", "price"])
+
+
+class BomCollector(object):
+    """
+    Walk assemblies with an explicit stack and yield their BOM records. The profile and trim a member is built on,
+    its Target edge, its cutting angles and its length are resolved once per object, memoized by object name, so
+    members sharing a chain don't walk it again.
+    """
+
+    def __init__(self, full_parent_path=False):
+        self.full_parent_path = full_parent_path
+        self._chains = {}
+        self._edges = {}
+        self._angles = {}
+        self._lengths = {}
+
+    def collect(self, objects, parent=""):
+        stack = [(obj, parent) for obj in reversed(objects)]
+        while stack:
+            obj, parent = stack.pop()
+
+            children = self.children(obj)
+            if children is not None:
+                child_parent = (f"{parent} / " if self.full_parent_path else "") + obj.Label
+                stack.extend((child, child_parent) for child in reversed(children))
+
+            elif is_profile(obj):
+                yield self.profile_record(obj, parent)
+
+            elif is_trimmedbody(obj):
+                yield self.member_record(obj.Label, parent, obj, has_cutout=False)
+
+            elif is_extrudedcutout(obj):
+                # a cutout of several bodies gives a line per body
+                bodies = get_extrudedcutout_bodies(obj)
+                for bo in bodies:
+                    label = obj.Label if len(bodies) == 1 else f"{obj.Label} ({bo.Label})"
+                    yield self.member_record(label, parent, bo, has_cutout=True)
+
+            elif is_link(obj):
+                yield LinkRecord(
+                    parent, obj.Label, obj.LinkedObject.Label, "1", getattr(obj.LinkedObject, "Price", "N/A")
+                )
+
+            elif is_part_or_part_design(obj):
+                yield LinkRecord(parent, obj.Label, obj.Label, "1", getattr(obj, "Price", "N/A"))
+
+    def children(self, obj):
+        """Children of a container, or None if 'obj' is not one."""
+        if is_fusion(obj):
+            return obj.Shapes
+
+        elif is_group(obj):
+            return obj.Group
+
+        elif is_part(obj):
             # TODO: Fix this ugly way to find children
             # I didn't find another way when into a Part
             # It makes it mandatory to have visible object when generating BOM
-            if child.getParentGroup() in (obj, None) and child.Visibility:
-                traverse_assembly(
-                    profiles_data,
-                    links_data,
-                    child,
-                    parent=(f"{parent} / " if full_parent_path else "") + obj.Label,
-                    full_parent_path=full_parent_path,
-                )
+            return [child for child in obj.Group if child.getParentGroup() in (obj, None) and child.Visibility]
+
+        return None
 
-    elif is_profile(obj):
+    def profile_record(self, obj, parent):
         cut_angles = get_readable_cutting_angles(
             getattr(obj, "BevelStartCut1", "N/A"),
             getattr(obj, "BevelStartCut2", "N/A"),
@@ -246,42 +353,25 @@ def traverse_assembly(profiles_data, links_data, obj, parent="", full_parent_pat
             getattr(obj, "BevelEndCut2", "N/A"),
         )
 
-        p["parent"] = parent
-        p["label"] = obj.Label
-        p["family"] = (
-            getattr(getattr(obj, "CustomProfile"), "Label", "Custom Profile")
-            if hasattr(obj, "CustomProfile")
-            else getattr(obj, "Family", "N/A")
+        return ProfileRecord(
+            parent=parent,
+            label=obj.Label,
+            family=self.family(obj),
+            size_name=getattr(obj, "SizeName", "N/A"),
+            material=getattr(obj, "Material", "N/A"),
+            length=f"{self.length(obj):.1f}",
+            cut_angle_1=cut_angles[0],
+            cut_angle_2=cut_angles[1],
+            cutout="",
+            approx_weight=str(getattr(obj, "ApproxWeight", "N/A")),
+            price=str(getattr(obj, "Price", "N/A")),
+            quantity=getattr(obj, "Quantity", "1"),
         )
-        p["size_name"] = getattr(obj, "SizeName", "N/A")
-        p["material"] = getattr(obj, "Material", "N/A")
-        p["length"] = f"{length_along_normal(obj):.1f}"
-        p["cut_angle_1"] = cut_angles[0]
-        p["cut_angle_2"] = cut_angles[1]
-        p["cutout"] = ""
-        p["approx_weight"] = str(getattr(obj, "ApproxWeight", "N/A"))
-        p["price"] = str(getattr(obj, "Price", "N/A"))
-        p["quantity"] = getattr(obj, "Quantity", "1")
-
-        profiles_data.append(p)
-
-    elif is_trimmedbody(obj) or is_extrudedcutout(obj):
-        if is_trimmedbody(obj):
-            prof = get_profile_from_trimmedbody(obj)
-            trim_prof = obj
-
-            angles = get_all_cutting_angles(obj)
-            has_cutout = False
-
-        elif is_extrudedcutout(obj):
-            prof = get_profile_from_extrudedcutout(obj)
-            trim_prof = get_trimmedprofile_from_extrudedcutout(obj)
-            if trim_prof:
-                angles = get_all_cutting_angles(trim_prof)
-            else:
-                angles = ()
 
-            has_cutout = True
+    def member_record(self, label, parent, obj, has_cutout):
+        """Record of the trimmed or cut member 'obj'."""
+        prof, trim_prof = self.chain(obj)
+        angles = self.cutting_angles(trim_prof) if trim_prof else ()
 
         cut_angles = get_readable_cutting_angles(
             getattr(prof, "BevelStartCut1", "N/A"),
@@ -291,46 +381,104 @@ def traverse_assembly(profiles_data, links_data, obj, parent="", full_parent_pat
             *angles,
         )
 
-        p["parent"] = parent
-        p["label"] = obj.Label
-        p["family"] = (
-            getattr(getattr(prof, "CustomProfile"), "Label", "Custom Profile")
-            if hasattr(prof, "CustomProfile")
-            else getattr(prof, "Family", "N/A")
-        )
-        p["size_name"] = getattr(prof, "SizeName", "N/A")
-        p["material"] = getattr(prof, "Material", "N/A")
-        p["length"] = f"{length_along_normal(trim_prof if trim_prof else prof):.1f}"
-        p["cut_angle_1"] = cut_angles[0]
-        p["cut_angle_2"] = cut_angles[1]
-        p["cutout"] = "Yes" if has_cutout else ""
-        p["approx_weight"] = str(getattr(prof, "ApproxWeight", "N/A"))
-        p["price"] = str(getattr(prof, "Price", "N/A"))
-        p["quantity"] = "1"
-
-        profiles_data.append(p)
-
-    elif is_link(obj):
-        links_data.append(
-            {
-                "parent": parent,
-                "label": obj.Label,
-                "part": obj.LinkedObject.Label,
-                "quantity": "1",
-                "price": getattr(obj.LinkedObject, "Price", "N/A"),
-            }
+        return ProfileRecord(
+            parent=parent,
+            label=label,
+            family=self.family(prof),
+            size_name=getattr(prof, "SizeName", "N/A"),
+            material=getattr(prof, "Material", "N/A"),
+            length=f"{self.length(trim_prof if trim_prof else prof):.1f}",
+            cut_angle_1=cut_angles[0],
+            cut_angle_2=cut_angles[1],
+            cutout="Yes" if has_cutout else "",
+            approx_weight=str(getattr(prof, "ApproxWeight", "N/A")),
+            price=str(getattr(prof, "Price", "N/A")),
+            quantity="1",
         )
 
-    elif is_part_or_part_design(obj):
-        links_data.append(
-            {
-                "parent": parent,
-                "label": obj.Label,
-                "part": obj.Label,
-                "quantity": "1",
-                "price": getattr(obj, "Price", "N/A"),
-            }
-        )
+    def family(self, prof):
+        if hasattr(prof, "CustomProfile"):
+            return getattr(getattr(prof, "CustomProfile"), "Label", "Custom Profile")
+        return getattr(prof, "Family", "N/A")
+
+    def chain(self, obj):
+        """Return the profile 'obj' is built on and the last trim under it (or None), walking the chain once."""
+        path = []
+        while obj is not None and obj.Name not in self._chains:
+            if is_trimmedbody(obj):
+                path.append(obj)
+                obj = obj.TrimmedBody
+            elif is_extrudedcutout(obj):
+                path.append(obj)
+                obj = obj.baseObject[0]
+            else:
+                self._chains[obj.Name] = (obj if is_profile(obj) else None, None)
+
+        prof, trim_prof = self._chains[obj.Name] if obj is not None else (None, None)
+        for o in reversed(path):
+            if is_trimmedbody(o):
+                trim_prof = o
+            self._chains[o.Name] = (prof, trim_prof)
+
+        return self._chains[path[0].Name] if path else (prof, trim_prof)
+
+    def edge(self, obj):
+        """Target edge of the profile 'obj' is built on."""
+        path = []
+        while obj.Name not in self._edges:
+            path.append(obj)
+            if getattr(obj, "Target", None):
+                self._edges[obj.Name] = obj.Target[0].getSubObject(obj.Target[1][0])
+            elif is_trimmedbody(obj):
+                obj = obj.TrimmedBody
+            elif is_extrudedcutout(obj):
+                obj = obj.baseObject[0]
+            else:
+                raise ValueError(f"{obj.Label} is not built on an edge")
+
+        for o in path:
+            self._edges[o.Name] = self._edges[obj.Name]
+
+        return self._edges[obj.Name]
+
+    def cutting_angles(self, trimmed_profile):
+        """Cutting angles of 'trimmed_profile' and of the trims under it."""
+        chain = []
+        trim = trimmed_profile
+        while trim.Name not in self._angles:
+            chain.append(trim)
+            if not hasattr(trim.TrimmedBody, "TrimmedProfileType"):
+                break
+            trim = trim.TrimmedBody
+
+        for trim in reversed(chain):
+            angles = get_cutting_angles(trim, self.edge)
+            if hasattr(trim.TrimmedBody, "TrimmedProfileType"):
+                angles = angles + self._angles[trim.TrimmedBody.Name]
+            self._angles[trim.Name] = angles
+
+        return self._angles[trimmed_profile.Name]
+
+    def length(self, obj):
+        if obj.Name not in self._lengths:
+            if is_profile(obj) or is_trimmedbody(obj):
+                self._lengths[obj.Name] = length_along_normal(obj, lambda: self.edge(obj))
+            else:
+                self._lengths[obj.Name] = 0.0
+
+        return self._lengths[obj.Name]
+
+
+def traverse_assembly(profiles_data, links_data, obj, parent="", full_parent_path=False, collector=None):
+    """Append the BOM lines of 'obj' to 'profiles_data' and 'links_data', as dicts."""
+    if collector is None:
+        collector = BomCollector(full_parent_path)
+
+    for record in collector.collect([obj], parent):
+        if isinstance(record, ProfileRecord):
+            profiles_data.append(record._asdict())
+        else:
+            links_data.append(record._asdict())
 
 
 def group_profiles(profiles_data):
@@ -397,73 +545,76 @@ def group_links(links_data):
 def make_bom(profiles_data, links_data, bom_name="BOM"):
     doc = FreeCAD.ActiveDocument
     spreadsheet = doc.addObject("Spreadsheet::Sheet", bom_name)
-
-    spreadsheet.set("A1", "Profiles")
-
-    spreadsheet.set("A2", "Parent")
-    spreadsheet.set("B2", "Name")
-    spreadsheet.set("C2", "Family")
-    spreadsheet.set("D2", "SizeName")
-    spreadsheet.set("E2", "Material")
-    spreadsheet.set("F2", "Length")
-    spreadsheet.set("G2", "CutAngle1")
-    spreadsheet.set("H2", "CutAngle2")
-    spreadsheet.set("I2", "Drill/Cutout")
-    spreadsheet.set("J2", "ApproxWeight")
-    spreadsheet.set("K2", "Price/U")
-    spreadsheet.set("L2", "Quantity")
+    cells = SheetWriter()
+
+    cells.set("A1", "Profiles")
+
+    cells.set("A2", "Parent")
+    cells.set("B2", "Name")
+    cells.set("C2", "Family")
+    cells.set("D2", "SizeName")
+    cells.set("E2", "Material")
+    cells.set("F2", "Length")
+    cells.set("G2", "CutAngle1")
+    cells.set("H2", "CutAngle2")
+    cells.set("I2", "Drill/Cutout")
+    cells.set("J2", "ApproxWeight")
+    cells.set("K2", "Price/U")
+    cells.set("L2", "Quantity")
 
     row = 3
 
     for prof in profiles_data:
-        spreadsheet.set("A" + str(row), prof["parent"])
-        spreadsheet.set("B" + str(row), prof["label"])
-        spreadsheet.set("C" + str(row), prof["family"])
-        spreadsheet.set("D" + str(row), prof["size_name"])
-        spreadsheet.set("E" + str(row), prof["material"])
-        spreadsheet.set("F" + str(row), prof["length"])
-        spreadsheet.set("G" + str(row), "'" + str(prof["cut_angle_1"]))
-        spreadsheet.set("H" + str(row), "'" + str(prof["cut_angle_2"]))
-        spreadsheet.set("I" + str(row), "'" + str(prof["cutout"]))
-        spreadsheet.set("J" + str(row), prof["approx_weight"])
-        spreadsheet.set("K" + str(row), prof["price"])
-        spreadsheet.set("L" + str(row), str(prof["quantity"]))
+        cells.set("A" + str(row), prof["parent"])
+        cells.set("B" + str(row), prof["label"])
+        cells.set("C" + str(row), prof["family"])
+        cells.set("D" + str(row), prof["size_name"])
+        cells.set("E" + str(row), prof["material"])
+        cells.set("F" + str(row), prof["length"])
+        cells.set("G" + str(row), "'" + str(prof["cut_angle_1"]))
+        cells.set("H" + str(row), "'" + str(prof["cut_angle_2"]))
+        cells.set("I" + str(row), "'" + str(prof["cutout"]))
+        cells.set("J" + str(row), prof["approx_weight"])
+        cells.set("K" + str(row), prof["price"])
+        cells.set("L" + str(row), str(prof["quantity"]))
 
         row += 1
 
     if len(links_data) > 0:
         row += 1
-        spreadsheet.set("A" + str(row), "Parts")
+        cells.set("A" + str(row), "Parts")
         row += 1
-        spreadsheet.set("A" + str(row), "Parent")
-        spreadsheet.set("B" + str(row), "Name")
-        spreadsheet.set("C" + str(row), "Part/Type")
-        spreadsheet.set("D" + str(row), "Price/U")
-        spreadsheet.set("E" + str(row), "Quantity")
+        cells.set("A" + str(row), "Parent")
+        cells.set("B" + str(row), "Name")
+        cells.set("C" + str(row), "Part/Type")
+        cells.set("D" + str(row), "Price/U")
+        cells.set("E" + str(row), "Quantity")
         row += 1
 
         for lnk in links_data:
-            spreadsheet.set("A" + str(row), lnk["parent"])
-            spreadsheet.set("B" + str(row), lnk["label"])
-            spreadsheet.set("C" + str(row), lnk["part"])
-            spreadsheet.set("D" + str(row), str(lnk["price"]))
-            spreadsheet.set("E" + str(row), str(lnk["quantity"]))
+            cells.set("A" + str(row), lnk["parent"])
+            cells.set("B" + str(row), lnk["label"])
+            cells.set("C" + str(row), lnk["part"])
+            cells.set("D" + str(row), str(lnk["price"]))
+            cells.set("E" + str(row), str(lnk["quantity"]))
 
             row += 1
 
     row += 2
-    spreadsheet.set("A" + str(row), "Legend")
-    spreadsheet.set("A" + str(row + 1), "*")
-    spreadsheet.set("B" + str(row + 1), "Angles 1 and 2 are rotated 90° along the edge")
-    spreadsheet.set("A" + str(row + 2), "-")
-    spreadsheet.set(
+    cells.set("A" + str(row), "Legend")
+    cells.set("A" + str(row + 1), "*")
+    cells.set("B" + str(row + 1), "Angles 1 and 2 are rotated 90° along the edge")
+    cells.set("A" + str(row + 2), "-")
+    cells.set(
         "B" + str(row + 2),
         "Angles 1 and 2 are cut in the same direction (no need to rotate the stock 180° when cutting)",
     )
-    spreadsheet.set("A" + str(row + 3), "@")
-    spreadsheet.set(
+    cells.set("A" + str(row + 3), "@")
+    cells.set(
         "B" + str(row + 3),
         "Angle is calculated from a TrimmedProfile -> be careful to check length, angles and cut direction",
     )
-    spreadsheet.set("A" + str(row + 4), "?")
-    spreadsheet.set("B" + str(row + 4), "Can't compute the angle, do it yourself !")
+    cells.set("A" + str(row + 4), "?")
+    cells.set("B" + str(row + 4), "Can't compute the angle, do it yourself !")
+
+    cells.write(spreadsheet)
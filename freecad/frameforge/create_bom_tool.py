@@ -6,6 +6,8 @@ import FreeCADGui as Gui
 
 from freecad.frameforge.best_fit import CutPart, Stock, best_fit_decreasing
 from freecad.frameforge.create_bom import (
+    BomCollector,
+    ProfileRecord,
     group_links,
     group_profiles,
     is_extrudedcutout,
@@ -15,23 +17,24 @@ from freecad.frameforge.create_bom import (
     is_profile,
     is_trimmedbody,
     make_bom,
-    traverse_assembly,
 )
 from freecad.frameforge.ff_tools import ICONPATH, PROFILEIMAGES_PATH, PROFILESPATH, UIPATH, translate
+from freecad.frameforge.sheet_writer import SheetWriter
 from freecad.frameforge.trimmed_profile import TrimmedProfile, ViewProviderTrimmedProfile
 
 
 def make_cut_list(sorted_stocks, cutlist_name="CutList"):
     doc = App.ActiveDocument
     spreadsheet = doc.addObject("Spreadsheet::Sheet", cutlist_name)
+    cells = SheetWriter()
 
-    spreadsheet.set("A1", "Material")
-    spreadsheet.set("B1", "Stock")
-    spreadsheet.set("C1", "CutPart")
-    spreadsheet.set("D1", "Length")
-    spreadsheet.set("E1", "CutAngle1")
-    spreadsheet.set("F1", "CutAngle2")
-    spreadsheet.set("G1", "Quantity")
+    cells.set("A1", "Material")
+    cells.set("B1", "Stock")
+    cells.set("C1", "CutPart")
+    cells.set("D1", "Length")
+    cells.set("E1", "CutAngle1")
+    cells.set("F1", "CutAngle2")
+    cells.set("G1", "Quantity")
 
     row = 2
 
@@ -42,14 +45,14 @@ def make_cut_list(sorted_stocks, cutlist_name="CutList"):
             for cut_part in stock.parts:
                 prof = cut_part.obj
                 if cut_part_idx == 0:
-                    spreadsheet.set("A" + str(row), stocks + f" / used = {stock.used:.1f}, left = {stock.left:.1f}")
+                    cells.set("A" + str(row), stocks + f" / used = {stock.used:.1f}, left = {stock.left:.1f}")
 
-                spreadsheet.set("B" + str(row), str(stock_idx))
-                spreadsheet.set("C" + str(row), prof["label"])
-                spreadsheet.set("D" + str(row), str(prof["length"]))
-                spreadsheet.set("E" + str(row), "'" + str(prof["cut_angle_1"]))
-                spreadsheet.set("F" + str(row), "'" + str(prof["cut_angle_2"]))
-                spreadsheet.set("G" + str(row), str(prof["quantity"]))
+                cells.set("B" + str(row), str(stock_idx))
+                cells.set("C" + str(row), prof["label"])
+                cells.set("D" + str(row), str(prof["length"]))
+                cells.set("E" + str(row), "'" + str(prof["cut_angle_1"]))
+                cells.set("F" + str(row), "'" + str(prof["cut_angle_2"]))
+                cells.set("G" + str(row), str(prof["quantity"]))
 
                 row += 1
                 cut_part_idx += 1
@@ -59,35 +62,37 @@ def make_cut_list(sorted_stocks, cutlist_name="CutList"):
         row += 1
 
     row += 1
-    spreadsheet.set("A" + str(row), "Stock statistics")
-    spreadsheet.set("B" + str(row), "Length Used")
-    spreadsheet.set("C" + str(row), "Stock Used")
-    spreadsheet.set("D" + str(row), "Stock Count")
+    cells.set("A" + str(row), "Stock statistics")
+    cells.set("B" + str(row), "Length Used")
+    cells.set("C" + str(row), "Stock Used")
+    cells.set("D" + str(row), "Stock Count")
     row += 1
     for stocks in sorted_stocks:
-        spreadsheet.set("A" + str(row), stocks)
-        spreadsheet.set("B" + str(row), f"{sum([s.used for s in sorted_stocks[stocks]])}")
-        spreadsheet.set("C" + str(row), f"{sum([s.length for s in sorted_stocks[stocks]])}")
-        spreadsheet.set("D" + str(row), f"{len(sorted_stocks[stocks])}")
+        cells.set("A" + str(row), stocks)
+        cells.set("B" + str(row), f"{sum([s.used for s in sorted_stocks[stocks]])}")
+        cells.set("C" + str(row), f"{sum([s.length for s in sorted_stocks[stocks]])}")
+        cells.set("D" + str(row), f"{len(sorted_stocks[stocks])}")
 
         row += 1
 
     row += 1
-    spreadsheet.set("A" + str(row), "Legend")
-    spreadsheet.set("A" + str(row + 1), "*")
-    spreadsheet.set("B" + str(row + 1), "Angles 1 and 2 are rotated 90° along the edge")
-    spreadsheet.set("A" + str(row + 2), "-")
-    spreadsheet.set(
+    cells.set("A" + str(row), "Legend")
+    cells.set("A" + str(row + 1), "*")
+    cells.set("B" + str(row + 1), "Angles 1 and 2 are rotated 90° along the edge")
+    cells.set("A" + str(row + 2), "-")
+    cells.set(
         "B" + str(row + 2),
         "Angles 1 and 2 are cut in the same direction (no need to rotate the stock 180° when cutting)",
     )
-    spreadsheet.set("A" + str(row + 3), "~")
-    spreadsheet.set(
+    cells.set("A" + str(row + 3), "~")
+    cells.set(
         "B" + str(row + 3),
         "Angle is calculated from a TrimmedProfile -> be careful to check length, angles and cut direction",
     )
-    spreadsheet.set("A" + str(row + 4), "?")
-    spreadsheet.set("B" + str(row + 4), "Can't compute the angle, do it yourself !")
+    cells.set("A" + str(row + 4), "?")
+    cells.set("B" + str(row + 4), "Can't compute the angle, do it yourself !")
+
+    cells.write(spreadsheet)
 
 
 class CreateBOMTaskPanel:
@@ -150,10 +155,11 @@ class CreateBOMTaskPanel:
 
             profiles_data = []
             links_data = []
-            for obj in sel:
-                traverse_assembly(
-                    profiles_data, links_data, obj, full_parent_path=self.form.full_parent_path.isChecked()
-                )
+            for record in BomCollector(self.form.full_parent_path.isChecked()).collect(sel):
+                if isinstance(record, ProfileRecord):
+                    profiles_data.append(record._asdict())
+                else:
+                    links_data.append(record._asdict())
 
             if self.form.group_profiles_cb.isChecked():
                 bom_data = group_profiles(profiles_data)
@@ -115,7 +115,8 @@ class AddExtrudedCutoutCommandClass:
                 "Extruded cutout from sketch extrusion\n"
                 "1. Select a face of the sheet metal part (must not be the thickness face) and\n"
                 "2. Select a sketch for the extruded cut (the sketch must be closed).\n"
-                "3. Use Property editor to modify other parameters",
+                "3. Optionally, select other bodies cut by the same sketch.\n"
+                "4. Use Property editor to modify other parameters and the pattern of the cut",
             ),
         }
 
@@ -148,6 +149,9 @@ class AddExtrudedCutoutCommandClass:
             selection = Gui.Selection.getSelectionEx()[1]
             cutSketch = selection.Object
 
+        # the other selected objects are cut by the same sketch
+        bodies = [sel.Object for sel in Gui.Selection.getSelectionEx()[2:]]
+
         if cutSketch is None or not selected_object.Shape:
             raise FrameForgeException("Both a valid sketch and an object with a shape must be selected.")
 
@@ -165,6 +169,7 @@ class AddExtrudedCutoutCommandClass:
             part.addObject(cutSketch)
 
         extruded_cutout = ExtrudedCutout(obj, cutSketch, selected_face)
+        obj.Bodies = bodies
         ViewProviderExtrudedCutout(obj.ViewObject)
         App.ActiveDocument.commitTransaction()
 
@@ -174,7 +179,7 @@ class AddExtrudedCutoutCommandClass:
         Gui.Control.showDialog(panel)
 
     def IsActive(self):
-        return len(Gui.Selection.getSelection()) == 2
+        return len(Gui.Selection.getSelection()) >= 2
 
 
 Gui.addCommand("FrameForge_AddExtrudeCutout", AddExtrudedCutoutCommandClass())
@@ -2,8 +2,6 @@ import glob
 import json
 import os
 
-import ArchCommands
-import BOPTools.SplitAPI
 import FreeCAD as App
 import FreeCADGui as Gui
 import Part
@@ -18,6 +16,9 @@ class CreateTrimmedProfileTaskPanel:
         ui_file = os.path.join(UIPATH, "create_trimmed_profiles.ui")
         self.form = Gui.PySideUic.loadUi(ui_file)
 
+        # the panel sets CutType values an older trim doesn't have yet
+        fp.Proxy.run_compatibility_migrations(fp)
+
         self.fp = fp
         self.dump = fp.dumpContent()
         self.mode = mode
@@ -41,11 +42,17 @@ class CreateTrimmedProfileTaskPanel:
         self.form.rb_simplefit.setIconSize(QSize)
         self.form.rb_simplefit.toggled.connect(lambda: self.update_cuttype("Simple fit"))
 
+        self.form.rb_tubecope.setIcon(coped_type_icon)
+        self.form.rb_tubecope.setIconSize(QSize)
+        self.form.rb_tubecope.toggled.connect(lambda: self.update_cuttype("Tube cope"))
+
         param = App.ParamGet("User parameter:BaseApp/Preferences/Frameforge")
         if param.GetString("Default Cut Type") == "Perfect fit":
             self.form.rb_perfectfit.toggle()
         elif param.GetString("Default Cut Type") == "Simple fit":
             self.form.rb_simplefit.toggle()
+        elif param.GetString("Default Cut Type") == "Tube cope":
+            self.form.rb_tubecope.toggle()
 
         self.form.add_trimmed_object_button.setIcon(add_icon)
         self.form.add_boundary_button.setIcon(add_icon)
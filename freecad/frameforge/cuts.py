@@ -0,0 +1,167 @@
+import BOPTools.SplitAPI
+import FreeCAD as App
+import Part
+
+# margin around the trimmed body when looking for the faces of the boundaries that can split it
+BOUNDARY_MARGIN = 1.0
+
+
+def trim_shape(body, boundaries=(), faces=(), miter_planes=(), copes=(), tolerance=0.0):
+    """
+    Trim 'body' and return the result, or None if there is nothing to cut.
+
+    boundaries: shapes splitting the body, the parts not holding its center of gravity are removed (Perfect fit);
+        ValueError if they don't split it
+    faces: planar faces, the body is cut on their outer side (Simple fit)
+    miter_planes: (point, direction, normal, bisect) tuples defining the miter planes (End Miter)
+    copes: (point, axis, radius, normal) tuples, the cylinders the body ends on and the normal of the plane of
+        their axis on the body side (Tube cope)
+    tolerance: fuzzy value of the boolean operation, 0 for an exact one
+    """
+    cut_shapes = []
+
+    tools = local_boundaries(body, boundaries)
+    if tools:
+        shps = BOPTools.SplitAPI.slice(body, tools, mode="Split")
+        cog = body.CenterOfGravity
+        for solid in shps.Solids:
+            if not solid.BoundBox.isInside(cog.x, cog.y, cog.z):
+                cut_shapes.append(Part.Shape(solid))
+
+    if len(boundaries) > 0 and len(cut_shapes) == 0:
+        raise ValueError("The trimming boundaries don't split the trimmed body")
+
+    for face in faces:
+        cut_shapes.append(outside_half_space(face.Surface.Position, face.Surface.Axis, body))
+
+    for point, direction, normal, bisect in miter_planes:
+        # the miter plane is normal to the edge direction, turned around the normal of the two edges plane
+        cut_shapes.append(outside_half_space(point, App.Rotation(normal, -90 + bisect).multVec(direction), body))
+
+    for point, axis, radius, normal in copes:
+        cut_shapes.append(cylinder_tool(point, axis, radius, body))
+        cut_shapes.append(outside_half_space(point, normal, body))
+
+    if len(cut_shapes) == 0:
+        return None
+
+    # a single boolean with all the tools, instead of fusing them first
+    return body.cut(cut_shapes, tolerance)
+
+
+def local_boundaries(body, boundaries, regions=None, margin=BOUNDARY_MARGIN):
+    """
+    Return the parts of the 'boundaries' shapes around 'body': compounds of their faces crossing the bounding box
+    of the body, so that the split doesn't compute the intersections of a whole beam or sub-assembly.
+
+    'regions' holds, for each boundary, the bounding boxes around the trimmed ends of the body: only the faces
+    crossing one of them are kept. A boundary without regions (None), or without faces in its regions (it crosses
+    the body away from its ends), is clipped to the whole body.
+    """
+    bbox = body.BoundBox
+    bbox.enlarge(margin)
+
+    tools = []
+    for i, boundary in enumerate(boundaries):
+        if not boundary.BoundBox.intersect(bbox):
+            continue
+
+        boxes = regions[i] if regions is not None and regions[i] is not None else [bbox]
+        boxes = [box for box in boxes if boundary.BoundBox.intersect(box)]
+
+        faces = [
+            face
+            for face in boundary.Faces
+            if face.BoundBox.intersect(bbox) and any(face.BoundBox.intersect(box) for box in boxes)
+        ]
+        if not faces:
+            faces = [face for face in boundary.Faces if face.BoundBox.intersect(bbox)]
+        if faces:
+            tools.append(Part.Compound(faces))
+
+    return tools
+
+
+def outside_half_space(point, normal, shape, margin=BOUNDARY_MARGIN):
+    """
+    Return a box covering the part of 'shape' on the side of the plane ('point', 'normal') that doesn't hold the
+    center of gravity of 'shape'.
+    """
+    bbox = shape.BoundBox
+    center = bbox.Center
+    normal = App.Vector(normal).normalize()
+
+    # side of the plane to remove
+    if (shape.CenterOfGravity - point).dot(normal) > 0:
+        normal = -normal
+    offset = (center - point).dot(normal)
+
+    # the box face lies in the plane, centered on the projection of the bounding box center
+    size = bbox.DiagonalLength + 2 * margin
+    depth = size + abs(offset)
+    rotation = App.Rotation(App.Vector(0, 0, 1), normal)
+    origin = center - normal * offset - rotation.multVec(App.Vector(size / 2, size / 2, 0))
+
+    box = Part.makeBox(size, size, depth)
+    box.Placement = App.Placement(origin, rotation)
+    return box
+
+
+def cylinder_tool(point, axis, radius, shape, margin=BOUNDARY_MARGIN):
+    """Return the cylinder of axis ('point', 'axis') and 'radius', long enough to go through 'shape'."""
+    axis = App.Vector(axis).normalize()
+    center = shape.BoundBox.Center
+    length = shape.BoundBox.DiagonalLength + 2 * margin
+    middle = point + axis * (center - point).dot(axis)
+
+    return Part.makeCylinder(radius, length, middle - axis * (length / 2), axis)
+
+
+def through_depth(point, normal, bboxes, placements=(), margin=BOUNDARY_MARGIN):
+    """
+    Return the depth of an extrusion from the plane ('point', 'normal') along -'normal' going through all of
+    'bboxes': the extent of their corners below the plane, for the tool moved by each of 'placements'. Return 0 if
+    no corner lies below the plane: an extrusion along -'normal' cuts nothing.
+    """
+    normal = App.Vector(normal).normalize()
+    corners = [bbox.getPoint(i) for bbox in bboxes for i in range(8)]
+
+    depth = 0.0
+    for placement in placements or [App.Placement()]:
+        n = placement.Rotation.multVec(normal)
+        level = placement.multVec(point).dot(n)
+        depth = max(depth, max(level - corner.dot(n) for corner in corners))
+
+    return depth + margin if depth > 0 else 0.0
+
+
+def extruded_tool(sketch, direction):
+    """Return the faces of the closed wires of 'sketch' extruded along 'direction'."""
+    compFaces = Part.Compound([Part.Face(wire) for wire in sketch.Wires])
+    return compFaces.extrude(direction)
+
+
+def patterned(tool, placements):
+    """Return a compound of copies of 'tool' moved by each of 'placements'."""
+    copies = []
+    for placement in placements:
+        copy = tool.copy()
+        copy.Placement = placement.multiply(copy.Placement)
+        copies.append(copy)
+
+    return Part.Compound(copies)
+
+
+def extruded_cut(bases, tool):
+    """
+    Cut each of 'bases' with the solids of 'tool' around it, in one boolean per base. Returns the cut base, or a
+    compound of the cut bases when there are several.
+    """
+    solids = tool.Solids
+    results = []
+    for base in bases:
+        bbox = base.BoundBox
+        tools = [solid for solid in solids if solid.BoundBox.intersect(bbox)]
+        results.append(base.cut(tools) if tools else base.copy())
+
+    return results[0] if len(results) == 1 else Part.Compound(results)
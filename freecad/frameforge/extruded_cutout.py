@@ -7,11 +7,23 @@ import FreeCADGui as Gui
 import Part
 from PySide import QtCore, QtGui
 
-from freecad.frameforge.ff_tools import ICONPATH, PROFILEIMAGES_PATH, PROFILESPATH, UIPATH, translate
+from freecad.frameforge.brep_cache import cached_build, input_digest, shape_digest
+from freecad.frameforge.cuts import extruded_tool, patterned, through_depth
+from freecad.frameforge.ff_tools import ICONPATH, PROFILEIMAGES_PATH, PROFILESPATH, UIPATH, LRUCache, translate
 from freecad.frameforge.frameforge_exceptions import FrameForgeException
 
+# extruded sketches and patterned tools, reused while the sketch and the pattern are unchanged
+TOOL_CACHE_SIZE = 64
+tool_cache = LRUCache(TOOL_CACHE_SIZE)
+
+# "Through All" depths are rounded up to a multiple of this length (mm)
+DEPTH_STEP = 10.0
+
 
 class ExtrudedCutout:
+    # input_digest of the last built shape, set by execute and by the parallel rebuild
+    built_digest = None
+
     def __init__(self, obj, sketch, selected_face):
         """Initialize the parametric Sheet Metal Cut object and add
         properties.
@@ -45,8 +57,54 @@ class ExtrudedCutout:
         ]
         obj.CutType = "Through All"
 
+        self.add_bodies(obj)
+        self.add_pattern(obj)
+
         obj.Proxy = self
 
+    def add_bodies(self, obj):
+        obj.addProperty(
+            "App::PropertyLinkList",
+            "Bodies",
+            "ExtrudedCutout",
+            translate("FrameForge", "Other bodies cut by the same sketch"),
+        ).Bodies = []
+
+    def add_pattern(self, obj):
+        obj.addProperty(
+            "App::PropertyEnumeration", "PatternType", "Pattern", translate("FrameForge", "Pattern of the cut tool")
+        ).PatternType = ["None", "Linear", "Polar"]
+        obj.addProperty(
+            "App::PropertyInteger",
+            "PatternCount",
+            "Pattern",
+            translate("FrameForge", "Number of occurrences of the cut tool"),
+        ).PatternCount = 1
+        obj.addProperty(
+            "App::PropertyVector",
+            "PatternDirection",
+            "Pattern",
+            translate("FrameForge", "Direction of the linear pattern"),
+        ).PatternDirection = App.Vector(1, 0, 0)
+        obj.addProperty(
+            "App::PropertyLength",
+            "PatternSpacing",
+            "Pattern",
+            translate("FrameForge", "Distance between two occurrences of the linear pattern"),
+        ).PatternSpacing = 10.0
+        obj.addProperty(
+            "App::PropertyVector", "PatternCenter", "Pattern", translate("FrameForge", "Center of the polar pattern")
+        ).PatternCenter = App.Vector(0, 0, 0)
+        obj.addProperty(
+            "App::PropertyVector", "PatternAxis", "Pattern", translate("FrameForge", "Axis of the polar pattern")
+        ).PatternAxis = App.Vector(0, 0, 1)
+        obj.addProperty(
+            "App::PropertyAngle",
+            "PatternAngle",
+            "Pattern",
+            translate("FrameForge", "Angle covered by the polar pattern, 360 for a full turn"),
+        ).PatternAngle = 360.0
+
     def onChanged(self, fp, prop):
         """Respond to property changes."""
         if prop == "CutType":
@@ -58,48 +116,119 @@ class ExtrudedCutout:
     def execute(self, fp):
         """Perform the cut when the object is recomputed."""
         try:
-            # Ensure the Sketch and baseObject properties are valid.
-            if fp.Sketch is None or fp.baseObject is None:
-                raise FrameForgeException("Both the Sketch and baseObject properties must be set.")
-
-            cutSketch = fp.Sketch
-            selected_object, face_name = fp.baseObject
-
-            face_name = face_name[0]
-            selected_face = selected_object.Shape.getElement(face_name)
-            normal_vector = selected_face.normalAt(0, 0)
-
-            if fp.CutType == "Distance":
-                ExtLength = fp.ExtrusionLength.Value
-            else:
-                skCenter = cutSketch.Shape.BoundBox.Center
-                objCenter = selected_object.Shape.BoundBox.Center
-                distance = skCenter - objCenter
-                TotalLength = selected_object.Shape.BoundBox.DiagonalLength + distance.Length
+            self.run_compatibility_migrations(fp)
 
-                ExtLength = TotalLength
+            inputs = self.get_build_inputs(fp)
 
-            # Create face from sketch
-            skWiresList = cutSketch.Shape.Wires
-            myFacesList = []
-            for wire in skWiresList:
-                myFace = Part.Face(wire)
-                myFacesList.append(myFace)
+            # the cutout is unchanged if its inputs are, even if a linked object was recomputed
+            key = input_digest("ExtrudedCutout", inputs)
+            if key == self.built_digest and not fp.Shape.isNull():
+                return
 
-            compFaces = Part.Compound(myFacesList)
-
-            # Extrusion
-            extruded_shape = compFaces.extrude(-normal_vector * ExtLength)
-
-            # Soustraction (Cut)
-            cut_shape = selected_object.Shape.cut(extruded_shape)
-
-            # Assigne la forme au FeaturePython
-            fp.Shape = cut_shape
+            self.apply_shape(fp, cached_build("ExtrudedCutout", inputs, key))
+            self.built_digest = key
 
         except FrameForgeException as e:
             App.Console.PrintError(f"Error: {e}\n")
 
+    def get_build_inputs(self, fp):
+        """Return the arguments of cuts.extruded_cut."""
+        # Ensure the Sketch and baseObject properties are valid.
+        if fp.Sketch is None or fp.baseObject is None:
+            raise FrameForgeException("Both the Sketch and baseObject properties must be set.")
+
+        cutSketch = fp.Sketch
+        selected_object, face_name = fp.baseObject
+        bodies = self.get_bodies(fp)
+
+        face_name = face_name[0]
+        selected_face = selected_object.Shape.getElement(face_name)
+        normal_vector = selected_face.normalAt(0, 0)
+
+        placements = self.get_placements(fp)
+        if fp.CutType == "Distance":
+            ExtLength = fp.ExtrusionLength.Value
+        else:
+            # extent of the bodies under the sketch plane, rounded up so that small edits of the bodies reuse the
+            # same tool
+            skCenter = cutSketch.Shape.BoundBox.Center
+            depth = through_depth(skCenter, normal_vector, [body.Shape.BoundBox for body in bodies], placements)
+            if depth == 0:
+                raise FrameForgeException("The bodies are all on the side of the sketch normal, nothing is cut.")
+            ExtLength = math.ceil(depth / DEPTH_STEP) * DEPTH_STEP
+
+        tool = self.get_tool(cutSketch.Shape, normal_vector, ExtLength, placements)
+
+        return {"bases": [body.Shape for body in bodies], "tool": tool}
+
+    def get_bodies(self, fp):
+        """
+        Return the bodies cut by the cutout: its base object, then its other Bodies. The shape of the cutout is a
+        compound of the cut bodies, in this order, when there are several.
+        """
+        base = fp.baseObject[0]
+        return [base] + [body for body in getattr(fp, "Bodies", []) if body != base]
+
+    def get_tool(self, sketch, normal, depth, placements):
+        """Return the extruded sketch, patterned by 'placements', from the tool cache when possible."""
+        extrusion_inputs = {"sketch": shape_digest(sketch), "normal": normal, "depth": float(depth)}
+        key = input_digest("CutoutTool", dict(extrusion_inputs, placements=placements))
+        tool = tool_cache.get(key)
+        if tool is None:
+            extrusion_key = input_digest("CutoutTool", extrusion_inputs)
+            extrusion = tool_cache.get(extrusion_key)
+            if extrusion is None:
+                extrusion = extruded_tool(sketch, -normal * depth)
+                tool_cache.put(extrusion_key, extrusion)
+
+            tool = (
+                extrusion if len(placements) == 1 and placements[0].isIdentity() else patterned(extrusion, placements)
+            )
+            tool_cache.put(key, tool)
+
+        return tool
+
+    def get_placements(self, fp):
+        """Return the placements of the occurrences of the cut tool."""
+        count = max(getattr(fp, "PatternCount", 1), 1)
+        pattern = getattr(fp, "PatternType", "None")
+
+        if pattern == "Linear":
+            if fp.PatternDirection.Length == 0:
+                raise FrameForgeException("The direction of the linear pattern is null.")
+            if count > 1 and fp.PatternSpacing.Value == 0:
+                raise FrameForgeException("The spacing of the linear pattern is null.")
+            step = App.Vector(fp.PatternDirection).normalize() * fp.PatternSpacing.Value
+            return [App.Placement(step * i, App.Rotation()) for i in range(count)]
+
+        if pattern == "Polar":
+            if fp.PatternAxis.Length == 0:
+                raise FrameForgeException("The axis of the polar pattern is null.")
+            angle = fp.PatternAngle.Value
+            if count > 1 and abs(angle) < 1e-9:
+                raise FrameForgeException("The angle of the polar pattern is null.")
+            # a full turn has no occurrence on its last angle, it would be on the first one
+            step = angle / count if abs(angle % 360) < 1e-9 else angle / max(count - 1, 1)
+            return [
+                App.Placement(App.Vector(), App.Rotation(fp.PatternAxis, step * i), fp.PatternCenter)
+                for i in range(count)
+            ]
+
+        return [App.Placement()]
+
+    def run_compatibility_migrations(self, fp):
+        # add Bodies and the pattern (<= 0.1.7)
+        if not hasattr(fp, "Bodies"):
+            App.Console.PrintMessage(f"Frameforge::object migration : adding Bodies to {fp.Label}\n")
+            self.add_bodies(fp)
+        if not hasattr(fp, "PatternType"):
+            App.Console.PrintMessage(f"Frameforge::object migration : adding Pattern to {fp.Label}\n")
+            self.add_pattern(fp)
+
+    def apply_shape(self, fp, shape):
+        """Assign the result of cuts.extruded_cut."""
+        fp.Shape = shape
+
 
 class ViewProviderExtrudedCutout:
     """Part WB style ViewProvider."""
@@ -134,7 +263,7 @@ class ViewProviderExtrudedCutout:
         return mode
 
     def claimChildren(self):
-        childrens = [self.Object.baseObject[0], self.Object.Sketch]
+        childrens = [self.Object.baseObject[0], self.Object.Sketch] + list(getattr(self.Object, "Bodies", []))
         if len(childrens) > 0:
             for child in childrens:
                 if child:
@@ -150,6 +279,8 @@ class ViewProviderExtrudedCutout:
             self.Object.baseObject[0].ViewObject.Visibility = True
         if self.Object.Sketch:
             self.Object.Sketch.ViewObject.Visibility = True
+        for body in getattr(self.Object, "Bodies", []):
+            body.ViewObject.Visibility = True
         return True
 
     def __getstate__(self):
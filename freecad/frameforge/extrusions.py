@@ -21,425 +21,349 @@
 # **************************************************************************************
 
 
+import functools
+import json
 import math
+import os
 
+import numpy as np
 import Part
-from DraftGeomUtils import fillet as draft_fillet
 from FreeCAD import Vector
 
+from freecad.frameforge.ff_tools import EXTRUSIONSPATH, PROFILESPATH
 
-# ************************************************************************************************
-# ************************************************************************************************
-def vslot20x20():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (0, 0, True, False, True, False),
-        (0, 0, False, False, True, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+# Slot extrusions are described in aluminium_extrusion.json: families with a "profile" (vslot or tslot) and a
+# "series" key hold the slot geometry of each series, by pitch (or the name of the family they share it with).
+# A section of width x height is a single row of modules of the series whose pitch is the smallest dimension;
+# grids of modules (several rows and columns) are not generated, their inner cavities differ from stacked rows.
+# Only series whose slot geometry comes from vendor drawings are listed.
+SERIES_FILE = os.path.join(PROFILESPATH, "aluminium_extrusion.json")
 
-    vertices = 8 * [vslot_outline]
-    fillets = [5, 17, 29, 41]
-    corner_offset = 0
-    circle_offsets = [0]
+# faces already built, by slot_face parameters
+_faces = {}
 
-    face = vslot(symmetry, vertices, fillets, corner_offset, circle_offsets)
 
-    return face
+@functools.lru_cache(maxsize=None)
+def load_series():
+    """Return the slot extrusion families: family name -> (profile, closed sides, {pitch: geometry})."""
+    with open(SERIES_FILE) as fd:
+        families = json.load(fd)
 
+    series = {}
+    for name, family in families.items():
+        if "series" not in family:
+            continue
 
-# ************************************************************************************************
-def vslot20x40():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (-w, 0, True, True, False, False),
-        (-w, 0, False, True, True, False),
-        (-w, 0, True, False, True, False),
-        (-w, 0, False, False, True, True),
-        (-w, 0, True, True, True, True),
-        (-w, 0, False, True, False, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+        geometries = family["series"]
+        if isinstance(geometries, str):
+            geometries = families[geometries]["series"]
 
-    vertices = 12 * [vslot_outline]
+        series[name] = (
+            family["profile"],
+            tuple(family.get("closed_sides", [])),
+            {float(pitch): geometry for pitch, geometry in geometries.items()},
+        )
 
-    fillets = [5, 29, 41, 65]
-    corner_offset = -1 * w
-    circle_offsets = [0, -w]
+    return series
 
-    face = vslot(symmetry, vertices, fillets, corner_offset, circle_offsets)
-    return face
 
+def series_face(family, width, height):
+    """Return the face of a slot extrusion section of 'family', of size width x height."""
+    profile, closed_sides, geometries = load_series()[family]
 
-# ************************************************************************************************
-def vslot20x60():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (-w, 0, True, True, False, False),
-        (-w, 0, False, True, True, False),
-        (-2 * w, 0, True, True, False, False),
-        (-2 * w, 0, False, True, True, False),
-        (-2 * w, 0, True, False, True, False),
-        (-2 * w, 0, False, False, True, True),
-        (-2 * w, 0, True, True, True, True),
-        (-2 * w, 0, False, True, False, True),
-        (-w, 0, True, True, True, True),
-        (-w, 0, False, True, False, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+    pitch = min(width, height)
+    if pitch not in geometries:
+        raise ValueError(f"{family}: there is no {pitch:g} series")
 
-    vertices = 16 * [vslot_outline]
+    rows, columns = height / pitch, width / pitch
+    if rows != int(rows) or columns != int(columns):
+        raise ValueError(f"{family} {width:g}x{height:g} is not a multiple of the {pitch:g} series")
+    if rows > 1 and columns > 1:
+        raise ValueError(f"{family} {width:g}x{height:g}: grids of modules are not supported")
 
-    # add fillets in reverse order, as this inserts additional edges
-    fillets = [5, 41, 53, 89]
-    corner_offset = -2 * w
-    circle_offsets = [0, -w, -2 * w]
+    face = slot_face(profile, geometries[pitch], int(max(rows, columns)), closed_sides)
+    if rows > 1:
+        face.rotate(Vector(0, 0, 0), Vector(0, 0, 1), 90)
 
-    face = vslot(symmetry, vertices, fillets, corner_offset, circle_offsets)
     return face
 
 
-# ************************************************************************************************
-def vslot20x80():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (-w, 0, True, True, False, False),
-        (-w, 0, False, True, True, False),
-        (-2 * w, 0, True, True, False, False),
-        (-2 * w, 0, False, True, True, False),
-        (-3 * w, 0, True, True, False, False),
-        (-3 * w, 0, False, True, True, False),
-        (-3 * w, 0, True, False, True, False),
-        (-3 * w, 0, False, False, True, True),
-        (-3 * w, 0, True, True, True, True),
-        (-3 * w, 0, False, True, False, True),
-        (-2 * w, 0, True, True, True, True),
-        (-2 * w, 0, False, True, False, True),
-        (-w, 0, True, True, True, True),
-        (-w, 0, False, True, False, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+def slot_face(profile, geometry, modules=1, closed_sides=()):
+    """
+    Return a copy of the face of 'modules' slot extrusion modules side by side (along -X), built once per session
+    or loaded from a BREP resource if one is shipped (see export_brep_resources).
+    """
+    key = (profile, tuple(sorted(geometry.items())), modules, tuple(closed_sides))
+    face = _faces.get(key)
+    if face is None:
+        face = load_brep_resource(resource_name(profile, geometry, modules, closed_sides))
+        if face is None:
+            face = build_slot_face(profile, geometry, modules, closed_sides)
+        _faces[key] = face
 
-    vertices = 20 * [vslot_outline]
+    return face.copy()
 
-    # add fillets in reverse order, as this inserts additional edges
-    fillets = [5, 53, 65, 113]
-    corner_offset = -3 * w
-    circle_offsets = [0, -w, -2 * w, -3 * w]
 
-    face = vslot(symmetry, vertices, fillets, corner_offset, circle_offsets)
-    return face
+def build_slot_face(profile, geometry, modules=1, closed_sides=()):
+    if profile == "vslot":
+        return vslot(geometry, modules)
+    elif profile == "tslot":
+        return tslot(geometry, modules, closed_sides)
 
+    raise ValueError(f"Unknown slot profile: {profile}")
 
-# ************************************************************************************************
-def tslot20x20():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (0, 0, True, False, True, False),
-        (0, 0, False, False, True, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
 
-    vertices = 8 * [tslot_outline]
-    fillets = [5, 17, 29, 41]
-    corner_offset = 0
-    circle_offsets = [0]
+def resource_name(profile, geometry, modules, closed_sides):
+    name = f"{profile}_{geometry['pitch']:g}_{modules}"
+    if closed_sides:
+        name += "_closed_" + "_".join(str(side) for side in closed_sides)
+    return name
 
-    face = tslot(symmetry, vertices, fillets, [], [], corner_offset, circle_offsets)
-    return face
 
+def load_brep_resource(name):
+    filename = os.path.join(EXTRUSIONSPATH, name + ".brep")
+    if not os.path.isfile(filename):
+        return None
 
-# ************************************************************************************************
-def tslot20x20_three_slot():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (0, 0, True, False, True, False),
-        (0, 0, False, False, True, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+    shape = Part.Shape()
+    shape.read(filename)
+    if len(shape.Faces) != 1:
+        return None
 
-    vertices = [tslot_outline] + 2 * [tslot_closed] + 5 * [tslot_outline]
-    fillets = [5, 7, 19, 31]
+    return shape.Faces[0]
 
-    closed_symmetry = [
-        (0, 0, False, True, False, False),
-    ]
-    closed_vertices = [tslot_closed_space]
-
-    corner_offset = 0
-    circle_offsets = [0]
-
-    face = tslot(
-        symmetry,
-        vertices,
-        fillets,
-        closed_symmetry,
-        closed_vertices,
-        corner_offset,
-        circle_offsets,
-    )
-    return face
 
+def export_brep_resources(path=EXTRUSIONSPATH):
+    """Write the faces of all the sizes of aluminium_extrusion.json as BREP resources, from the FreeCAD console."""
+    with open(SERIES_FILE) as fd:
+        families = json.load(fd)
 
-# ************************************************************************************************
-def tslot20x20_two_slot():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (0, 0, True, False, True, False),
-        (0, 0, False, False, True, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+    os.makedirs(path, exist_ok=True)
+    for name, (profile, closed_sides, geometries) in load_series().items():
+        for size in families[name]["sizes"].values():
+            width, height = float(size["Width"]), float(size["Height"])
+            pitch = min(width, height)
+            modules = int(max(width, height) / pitch)
+            filename = os.path.join(path, resource_name(profile, geometries[pitch], modules, closed_sides) + ".brep")
+            build_slot_face(profile, geometries[pitch], modules, closed_sides).exportBrep(filename)
 
-    vertices = [tslot_outline] + 4 * [tslot_closed] + 3 * [tslot_outline]
-    fillets = [5, 7, 9, 21]
 
-    closed_symmetry = [
-        (0, 0, False, True, False, False),
-        (0, 0, False, False, True, False),
-    ]
-    closed_vertices = 2 * [tslot_closed_space]
-
-    corner_offset = 0
-    circle_offsets = [0]
-
-    face = tslot(
-        symmetry,
-        vertices,
-        fillets,
-        closed_symmetry,
-        closed_vertices,
-        corner_offset,
-        circle_offsets,
-    )
-    return face
+# ************************************************************************************************
+# ************************************************************************************************
+# 20 series sections, kept for compatibility
+def vslot20x20():
+    return series_face("V-Slot", 20.0, 20.0)
 
 
-# ************************************************************************************************
-def tslot20x20_two_slot_opp():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (0, 0, True, False, True, False),
-        (0, 0, False, False, True, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+def vslot20x40():
+    return series_face("V-Slot", 40.0, 20.0)
 
-    vertices = [tslot_outline] + 2 * [tslot_closed] + 2 * [tslot_outline] + 2 * [tslot_closed] + [tslot_outline]
-    fillets = [5, 7, 19, 21]
 
-    closed_symmetry = [
-        (0, 0, False, True, False, False),
-        (0, 0, False, True, False, True),
-    ]
-    closed_vertices = 2 * [tslot_closed_space]
-
-    corner_offset = 0
-    circle_offsets = [0]
-
-    face = tslot(
-        symmetry,
-        vertices,
-        fillets,
-        closed_symmetry,
-        closed_vertices,
-        corner_offset,
-        circle_offsets,
-    )
-    return face
+def vslot20x60():
+    return series_face("V-Slot", 60.0, 20.0)
 
 
-# ************************************************************************************************
-def tslot20x20_one_slot():
-    # due to symmetry this can be nicely decomposed
-    # x offset, y offset, reverse, switch, mir_x, mir_y
-    symmetry = [
-        (0, 0, False, False, False, False),
-        (0, 0, True, True, False, False),
-        (0, 0, False, True, True, False),
-        (0, 0, True, False, True, False),
-        (0, 0, False, False, True, True),
-        (0, 0, True, True, True, True),
-        (0, 0, False, True, False, True),
-        (0, 0, True, False, False, True),
-    ]
+def vslot20x80():
+    return series_face("V-Slot", 80.0, 20.0)
 
-    vertices = [tslot_outline] + 6 * [tslot_closed] + [tslot_outline]
-    fillets = [5, 7, 9, 11]
 
-    closed_symmetry = [
-        (0, 0, False, True, False, False),
-        (0, 0, False, False, True, False),
-        (0, 0, False, True, False, True),
-    ]
-    closed_vertices = 3 * [tslot_closed_space]
+def tslot20x20():
+    return series_face("T-Slot", 20.0, 20.0)
 
-    corner_offset = 0
-    circle_offsets = [0]
 
-    face = tslot(symmetry, vertices, fillets, closed_symmetry, closed_vertices, corner_offset, circle_offsets)
-    return face
+def tslot20x20_three_slot():
+    return series_face("T-Slot 3-Slots", 20.0, 20.0)
 
 
-# ************************************************************************************************
-# helper
-def fillet(lines, indices, radius):
-    """
-    fillets the corner between the segments and their successors in lines indicated by indices
-    """
+def tslot20x20_two_slot():
+    return series_face("T-Slot 2-Slots", 20.0, 20.0)
 
-    lines = lines[:]
 
-    # sort them in descending order, as filleting inserts additional edges
-    indices.sort()
-    indices.reverse()
+def tslot20x20_two_slot_opp():
+    return series_face("T-Slot 2-Slots Opp", 20.0, 20.0)
 
-    for i in indices:
-        lines[slice(i, i + 2)] = draft_fillet(lines[slice(i, i + 2)], radius)
 
-    return lines
+def tslot20x20_one_slot():
+    return series_face("T-Slot 1-Slot", 20.0, 20.0)
 
 
+# ************************************************************************************************
+# helper
 def assemble(symmetry, vertices, offset_global=(0, 0)):
     """
-    Assemble a wire from a list of symmetry information and a list of list of vertices
+    Assemble a polyline from a list of symmetry information and a list of list of vertices, return its points as
+    a (n, 2) array
 
     symmetry information is a tuple of
         offset x, offset y, bool reverse, bool switch_comp, bool mirror_x, bool mirror_y
     """
-
-    offset = Vector(offset_global[0], offset_global[1], 0)
-
-    lines = []
-
-    vlast = None
-    vcur = None
-
+    chunks = []
     for sym, verts in zip(symmetry, vertices):
         o_x, o_y, reverse, switch, mir_x, mir_y = sym
-        mir_x = -1 if mir_x else 1
-        mir_y = -1 if mir_y else 1
+        points = np.asarray(verts, dtype=float)[:, :2]
         if reverse:
-            verts = verts[::-1]
+            points = points[::-1]
+        if switch:
+            points = points[:, ::-1]
 
-        if vcur is None:
-            vcur = Vector(verts[0])
-            if switch:
-                vcur[0], vcur[1] = vcur[1], vcur[0]
+        points = points * (-1.0 if mir_x else 1.0, -1.0 if mir_y else 1.0) + (
+            o_x + offset_global[0],
+            o_y + offset_global[1],
+        )
 
-            vcur[0] = mir_x * vcur[0] + o_x + offset[0]
-            vcur[1] = mir_y * vcur[1] + o_y + offset[1]
+        # each chunk starts where the previous one ends
+        chunks.append(points[1:] if chunks else points)
 
-        for v in verts[1:]:
-            vlast = vcur
-            vcur = Vector(v)
-            if switch:
-                vcur[0], vcur[1] = vcur[1], vcur[0]
+    return np.vstack(chunks)
 
-            vcur[0] = mir_x * vcur[0] + o_x + offset[0]
-            vcur[1] = mir_y * vcur[1] + o_y + offset[1]
 
-            lines.append(Part.makeLine(vlast, vcur))
-    return lines
+def make_wire(points, corners=(), radius=0.0):
+    """
+    Build the wire of the polyline 'points', the corners between the segments and their successors indicated by
+    'corners' are rounded with 'radius'
+    """
+    starts = points[:-1].copy()
+    ends = points[1:].copy()
+
+    arcs = {}
+    if corners:
+        i = np.asarray(corners)
+        corner = points[i + 1]
+        u = corner - points[i]
+        u /= np.linalg.norm(u, axis=1)[:, None]
+        v = points[i + 2] - corner
+        v /= np.linalg.norm(v, axis=1)[:, None]
+
+        # half of the angle between the two segments
+        half = 0.5 * np.arccos(np.clip(-(u * v).sum(axis=1), -1.0, 1.0))
+        tangent = radius / np.tan(half)
+        bisector = v - u
+        bisector /= np.linalg.norm(bisector, axis=1)[:, None]
+        middle = corner + bisector * (radius / np.sin(half) - radius)[:, None]
+
+        ends[i] = corner - u * tangent[:, None]
+        starts[i + 1] = corner + v * tangent[:, None]
+        arcs = dict(zip(i.tolist(), middle.tolist()))
+
+    starts = starts.tolist()
+    ends = ends.tolist()
+    edges = []
+    for k, (start, end) in enumerate(zip(starts, ends)):
+        if start != end:
+            edges.append(Part.makeLine(Vector(*start, 0), Vector(*end, 0)))
+        if k in arcs:
+            edges.append(Part.Arc(Vector(*end, 0), Vector(*arcs[k], 0), Vector(*starts[k + 1], 0)).toShape())
+
+    return Part.Wire(edges)
+
+
+def outline_symmetry(w, modules):
+    """
+    Symmetry table of the outline of 'modules' modules of pitch 'w' side by side along -X. Every entry places one
+    eighth of the module outline, going counterclockwise from the middle of the +X side.
+    """
+    # x offset, y offset, reverse, switch, mir_x, mir_y
+    last = -(modules - 1) * w
+    symmetry = [
+        (0, 0, False, False, False, False),
+        (0, 0, True, True, False, False),
+        (0, 0, False, True, True, False),
+    ]
+    for k in range(1, modules):
+        symmetry += [(-k * w, 0, True, True, False, False), (-k * w, 0, False, True, True, False)]
+    symmetry += [(last, 0, True, False, True, False), (last, 0, False, False, True, True)]
+    for k in range(modules - 1, 0, -1):
+        symmetry += [(-k * w, 0, True, True, True, True), (-k * w, 0, False, True, False, True)]
+    symmetry += [
+        (0, 0, True, True, True, True),
+        (0, 0, False, True, False, True),
+        (0, 0, True, False, False, True),
+    ]
 
+    return symmetry
 
-# ************************************************************************************************
-# profile size
-w = 20
+
+def corner_fillets(symmetry, vertices):
+    """
+    Indices of the outline lines ending on an outer corner: the end of a forward eighth followed by a reversed
+    eighth along the other axis.
+    """
+    indices = []
+    lines = 0
+    for sym, next_sym, verts in zip(symmetry, symmetry[1:], vertices):
+        lines += len(verts) - 1
+        if not sym[2] and next_sym[2] and sym[3] != next_sym[3]:
+            indices.append(lines - 1)
+
+    return indices
 
 
 # ************************************************************************************************
 # Vslot profile:
+#   pitch: profile size
+#   slot_opening: width of the slot opening
+#   lip: thickness of the outer wall
+#   lip_inner: width of the slot lip, inside the outer wall
+#   chamfer: size of the 45 degrees chamfer of the slot
+#   corner_hole: offset of the corner hole chamfer
+#   space_x, space_y: size of the big spaces between modules
+#   corner_radius: radius of the outer corners
+#   center_hole: radius of the center hole
+
+
+def vslot_outline(g):
+    """one eight of the outline"""
+    w = g["pitch"]
+    d = g["slot_opening"] + g["chamfer"] * math.sqrt(2)  # the size of the inner square
+    y_lip = 0.5 * w - g["lip"] - g["lip_inner"] - g["chamfer"] / math.sqrt(2)
+
+    return [
+        (0.5 * d, 0, 0),
+        (0.5 * d, 0.5 * g["slot_opening"], 0),
+        (0.5 * w - g["lip"] - g["lip_inner"], y_lip, 0),
+        (0.5 * w - g["lip"], y_lip, 0),
+        (0.5 * w - g["lip"], 0.5 * g["slot_opening"], 0),
+        (0.5 * w, 0.5 * g["slot_opening"] + g["lip"], 0),
+        (0.5 * w, 0.5 * w, 0),
+    ]
+
+
+def vslot_space(g):
+    """big spaces"""
+    w = g["pitch"]
+    d = g["slot_opening"] + g["chamfer"] * math.sqrt(2)
+
+    return [
+        (0.5 * d, 0, 0),
+        (0.5 * d, 0.5 * g["slot_opening"], 0),
+        (0.5 * w - g["space_x"], 0.5 * w - g["lip"] - g["space_y"], 0),
+        (0.5 * w - g["space_x"], 0.5 * w - g["lip"], 0),
+        (0.5 * w, 0.5 * w - g["lip"], 0),
+    ]
 
-# the size of the inner square
-d = 5.68 + 3 / math.sqrt(2)
-
-# one eight of the outline
-vslot_outline = [
-    (0.5 * d, 0, 0),
-    (0.5 * d, 0.5 * 5.68, 0),
-    (0.5 * w - 1.8 - 1.64, 0.5 * w - 1.8 - 1.64 - 1.5 / math.sqrt(2), 0),
-    (0.5 * w - 1.8, 0.5 * w - 1.8 - 1.64 - 1.5 / math.sqrt(2), 0),
-    (0.5 * w - 1.8, 0.5 * 5.68, 0),
-    (0.5 * w, 0.5 * 5.68 + 1.8, 0),
-    (0.5 * w, 0.5 * w, 0),
-]
-
-space_symmetry = [
-    (0, 0, False, False, True, False),
-    (-w, 0, True, False, False, False),
-    (-w, 0, False, False, False, True),
-    (0, 0, True, False, True, True),
-]
-
-# big spaces
-vslot_space = [
-    (0.5 * d, 0, 0),
-    (0.5 * d, 0.5 * 5.68, 0),
-    (0.5 * w - 2.7, 0.5 * w - 1.8 - 1.96, 0),
-    (0.5 * w - 2.7, 0.5 * w - 1.8, 0),
-    (0.5 * w, 0.5 * w - 1.8, 0),
-]
-
-# corner holes
-vslot_cornerhole = [
-    (0.5 * w - 1.8, 0.5 * w - 1.8 - 1.64 - 1.5 / math.sqrt(2) + 1.07, 0),
-    (0.5 * w - 1.8, 0.5 * w - 1.8, 0),
-    (0.5 * w - 1.8 - 1.64 - 1.5 / math.sqrt(2) + 1.07, 0.5 * w - 1.8, 0),
-    (0.5 * w - 1.8, 0.5 * w - 1.8 - 1.64 - 1.5 / math.sqrt(2) + 1.07, 0),
-]
-
-
-def vslot(symmetry, vertices, fillets, corner_offset, circle_offsets):
-    outline = assemble(symmetry, vertices)
-    outline = fillet(outline, fillets, 1.5)
-    outline = Part.Wire(outline)
+
+def vslot_cornerhole(g):
+    """corner holes"""
+    w = g["pitch"]
+    c = 0.5 * w - g["lip"] - g["lip_inner"] - g["chamfer"] / math.sqrt(2) + g["corner_hole"]
+
+    return [
+        (0.5 * w - g["lip"], c, 0),
+        (0.5 * w - g["lip"], 0.5 * w - g["lip"], 0),
+        (c, 0.5 * w - g["lip"], 0),
+        (0.5 * w - g["lip"], c, 0),
+    ]
+
+
+def vslot(g, modules):
+    w = g["pitch"]
+    corner_offset = -(modules - 1) * w
+    circle_offsets = [-k * w for k in range(modules)]
+
+    symmetry = outline_symmetry(w, modules)
+    vertices = len(symmetry) * [vslot_outline(g)]
+
+    outline = make_wire(assemble(symmetry, vertices), corner_fillets(symmetry, vertices), g["corner_radius"])
 
     holes = []
 
@@ -453,22 +377,25 @@ def vslot(symmetry, vertices, fillets, corner_offset, circle_offsets):
     ]
 
     for sym in corner_symmetry:
-        holes.append(Part.Wire(assemble([sym], [vslot_cornerhole])))
+        holes.append(make_wire(assemble([sym], [vslot_cornerhole(g)])))
         if sym[4] == sym[5]:
             holes[-1].reverse()
 
     # circular holes
     for offset in circle_offsets:
-        holes.append(Part.Wire(Part.makeCircle(2.1, Vector(offset, 0, 0))))
+        holes.append(Part.Wire(Part.makeCircle(g["center_hole"], Vector(offset, 0, 0))))
         holes[-1].reverse()
 
     # big spaces
-    print("Space")
+    space_symmetry = [
+        (0, 0, False, False, True, False),
+        (-w, 0, True, False, False, False),
+        (-w, 0, False, False, False, True),
+        (0, 0, True, False, True, True),
+    ]
     for offset in circle_offsets[:-1]:
-        print(space_symmetry, vslot_space)
-        holes.append(Part.Wire(assemble(space_symmetry, 4 * [vslot_space], (offset, 0))))
+        holes.append(make_wire(assemble(space_symmetry, 4 * [vslot_space(g)], (offset, 0))))
         holes[-1].reverse()
-    print("Space")
 
     # put everything together
     return Part.Face([outline] + holes)
@@ -476,62 +403,99 @@ def vslot(symmetry, vertices, fillets, corner_offset, circle_offsets):
 
 # ************************************************************************************************
 # T slot profile:
+#   pitch: profile size
+#   slot_opening: width of the slot opening
+#   lip: thickness of the outer wall
+#   slot_width: width of the slot, behind the outer wall
+#   slot_bottom: width of the bottom of the slot
+#   slot_depth: depth of the slot, from the outer face
+#   chamfer_depth: depth where the slot starts to narrow, from the outer face
+#   corner_radius: radius of the outer corners
+#   center_hole: radius of the center hole
+
+# closed sides (1: +Y, 2: -X, 3: -Y, 4: +X): eighths of the outline replaced by a straight line, and symmetry of
+# the closed slot space
+TSLOT_CLOSED_SIDES = {
+    1: ((1, 2), (0, 0, False, True, False, False)),
+    2: ((3, 4), (0, 0, False, False, True, False)),
+    3: ((5, 6), (0, 0, False, True, False, True)),
+    4: ((7, 0), (0, 0, False, False, False, False)),
+}
+
+
+def tslot_outline(g):
+    """outline"""
+    h = 0.5 * g["pitch"]
+
+    return [
+        (h - g["slot_depth"], 0, 0),
+        (h - g["slot_depth"], 0.5 * g["slot_bottom"], 0),
+        (h - g["chamfer_depth"], 0.5 * g["slot_width"], 0),
+        (h - g["lip"], 0.5 * g["slot_width"], 0),
+        (h - g["lip"], 0.5 * g["slot_opening"], 0),
+        (h, 0.5 * g["slot_opening"], 0),
+        (h, h, 0),
+    ]
+
+
+def tslot_closed(g):
+    """closed slots ouline"""
+    h = 0.5 * g["pitch"]
+
+    return [
+        (h, 0.0, 0),
+        (h, h, 0),
+    ]
+
+
+def tslot_closed_space(g):
+    """closed slots spaces"""
+    h = 0.5 * g["pitch"]
+
+    return [
+        (h - g["slot_depth"], 0, 0),
+        (h - g["slot_depth"], 0.5 * g["slot_bottom"], 0),
+        (h - g["chamfer_depth"], 0.5 * g["slot_width"], 0),
+        (h - g["lip"], 0.5 * g["slot_width"], 0),
+        (h - g["lip"], -0.5 * g["slot_width"], 0),
+        (h - g["chamfer_depth"], -0.5 * g["slot_width"], 0),
+        (h - g["slot_depth"], -0.5 * g["slot_bottom"], 0),
+        (h - g["slot_depth"], 0, 0),
+    ]
+
+
+def tslot(g, modules, closed_sides=()):
+    if closed_sides and modules > 1:
+        raise ValueError("Closed slots are only available on single module T-Slot sections")
+
+    w = g["pitch"]
+    circle_offsets = [-k * w for k in range(modules)]
+
+    symmetry = outline_symmetry(w, modules)
+    vertices = len(symmetry) * [tslot_outline(g)]
+
+    closed_symmetry = []
+    closed_vertices = []
+    for side in closed_sides:
+        eighths, sym = TSLOT_CLOSED_SIDES[side]
+        for i in eighths:
+            vertices[i] = tslot_closed(g)
+        closed_symmetry.append(sym)
+        closed_vertices.append(tslot_closed_space(g))
 
-# outline
-tslot_outline = [
-    (5.0, 0, 0),
-    (5.0, 3.5, 0),
-    (7.5, 6.0, 0),
-    (9.0, 6.0, 0),
-    (9.0, 3.0, 0),
-    (10.0, 3.0, 0),
-    (10.0, 10.0, 0),
-]
-
-# closed slots ouline
-tslot_closed = [
-    (10.0, 0.0, 0),
-    (10.0, 10.0, 0),
-]
-
-# closed slots spaces
-tslot_closed_space = [
-    (5.0, 0, 0),
-    (5.0, 3.5, 0),
-    (7.5, 6.0, 0),
-    (9.0, 6.0, 0),
-    (9.0, -6.0, 0),
-    (7.5, -6.0, 0),
-    (5.0, -3.5, 0),
-    (5.0, 0, 0),
-]
-
-# big spaces
-tslot_space = [
-    (0.5 * d, 0, 0),
-    (0.5 * d, 0.5 * 5.68, 0),
-    (0.5 * w - 2.7, 0.5 * w - 1.8 - 1.96, 0),
-    (0.5 * w - 2.7, 0.5 * w - 1.8, 0),
-    (0.5 * w, 0.5 * w - 1.8, 0),
-]
-
-
-def tslot(symmetry, vertices, fillets, closed_symmetry, closed_vertices, corner_offset, circle_offsets):
-    outline = assemble(symmetry, vertices)
-    outline = fillet(outline, fillets, 1.5)
-    outline = Part.Wire(outline)
+    outline = make_wire(assemble(symmetry, vertices), corner_fillets(symmetry, vertices), g["corner_radius"])
 
     holes = []
 
     # closed holes
     for sym, vert in zip(closed_symmetry, closed_vertices):
-        holes.append(Part.Wire(assemble([sym], [vert])))
+        holes.append(make_wire(assemble([sym], [vert])))
         if not sym[5]:
             holes[-1].reverse()
 
     # circular holes
     for offset in circle_offsets:
-        holes.append(Part.Wire(Part.makeCircle(2.25, Vector(offset, 0, 0))))
+        holes.append(Part.Wire(Part.makeCircle(g["center_hole"], Vector(offset, 0, 0))))
         holes[-1].reverse()
 
     # put everything together
@@ -1,10 +1,12 @@
 import os
+from collections import OrderedDict
 
 import FreeCAD
 
 RESSOURCESPATH = os.path.join(os.path.dirname(__file__), "resources")
 
 PROFILESPATH = os.path.join(RESSOURCESPATH, "profiles")
+EXTRUSIONSPATH = os.path.join(RESSOURCESPATH, "extrusions")
 
 ICONPATH = os.path.join(RESSOURCESPATH, "icons")
 PROFILEIMAGES_PATH = os.path.join(RESSOURCESPATH, "images", "profiles")
@@ -24,3 +26,45 @@ class FormProxy(object):
             raise ValueError(f"{name} not a member of one of the forms")
 
         return getattr(self.members[name], name)
+
+
+class LRUCache(object):
+    """Bounded mapping that evicts the least recently used entry, with hit/miss counters."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
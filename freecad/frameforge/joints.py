@@ -0,0 +1,71 @@
+import math
+from collections import namedtuple
+
+from freecad.frameforge.ff_tools import LRUCache
+
+# Geometry of the miter joint between two member edges meeting at a common end, shared by the End Miter trims of
+# both members and by the BOM:
+#   point: common end of the edges
+#   normal: normal of the plane of the two edges (oriented for the first edge of the pair)
+#   bisect: half of the angle between the two members, from the common end
+#   cut_angle: angle of the miter cut from a square cut
+MiterJoint = namedtuple("MiterJoint", ["point", "normal", "bisect", "cut_angle"])
+
+# distance under which the edges ends are the same point
+PRECISION = 0.001
+
+# joints by pair of edges, computed for the first member and reused for the second one
+JOINT_CACHE_SIZE = 4096
+joint_cache = LRUCache(JOINT_CACHE_SIZE)
+
+
+def edge_key(edge):
+    return tuple(round(c, 6) + 0.0 for v in (edge.Vertexes[0].Point, edge.Vertexes[-1].Point) for c in v)
+
+
+def miter_joint(edge1, edge2):
+    """Return the MiterJoint of the two straight edges, oriented for 'edge1'."""
+    key1, key2 = edge_key(edge1), edge_key(edge2)
+    key = (key1, key2) if key1 <= key2 else (key2, key1)
+
+    joint = joint_cache.get(key)
+    if joint is None:
+        joint = compute_miter_joint(edge1, edge2) if key1 <= key2 else compute_miter_joint(edge2, edge1)
+        joint_cache.put(key, joint)
+
+    if key1 > key2:
+        # the normal of the edges plane is reversed when the edges are swapped
+        joint = joint._replace(normal=-joint.normal)
+
+    return joint
+
+
+def compute_miter_joint(edge1, edge2):
+    start1, end1 = edge1.Vertexes[0].Point, edge1.Vertexes[-1].Point
+    start2, end2 = edge2.Vertexes[0].Point, edge2.Vertexes[-1].Point
+
+    # common end, and far ends of each edge
+    if start1.distanceToPoint(start2) < PRECISION:
+        point, far1, far2 = start1, end1, end2
+    elif start1.distanceToPoint(end2) < PRECISION:
+        point, far1, far2 = start1, end1, start2
+    elif end1.distanceToPoint(start2) < PRECISION:
+        point, far1, far2 = end1, start1, end2
+    elif end1.distanceToPoint(end2) < PRECISION:
+        point, far1, far2 = end1, start1, start2
+    else:
+        raise RuntimeError("End Miter: edges not aligned. Ensure they meet at a common endpoint.")
+
+    # angle between the members, going away from the common end
+    angle = math.degrees((far1 - point).getAngle(far2 - point))
+    bisect = angle / 2.0
+    normal = (far1 - point).cross(far2 - point).normalize()
+
+    return MiterJoint(point, normal, bisect, 90.0 - bisect)
+
+
+def miter_plane(edge1, edge2):
+    """Return the (point, direction, normal, bisect) tuple of cuts.trim_shape for the miter of 'edge1'."""
+    joint = miter_joint(edge1, edge2)
+    direction = edge1.Vertexes[0].Point - edge1.Vertexes[-1].Point
+    return joint.point, direction, joint.normal, joint.bisect
@@ -0,0 +1,116 @@
+import FreeCAD as App
+import Part
+
+from freecad.frameforge.bevels import make_beveled_solid
+from freecad.frameforge.cuts import extruded_cut, trim_shape
+from freecad.frameforge.frameforge_exceptions import FrameForgeException
+from freecad.frameforge.sections import SectionParams, make_section_face
+
+# Shape builders of the FrameForge features. They only depend on their arguments (no document access, no GUI),
+# so they can run in a worker process. Features expose get_build_inputs(obj) to collect the arguments and
+# apply_shape(obj, shape) to assign the result.
+
+vec = App.Base.Vector
+
+# proxy class name -> builder
+KERNELS = {}
+
+# tags of the values converted to plain data by pack()
+BREP = "__brep__"
+VECTOR = "__vector__"
+
+
+def kernel(name):
+    def register(func):
+        KERNELS[name] = func
+        return func
+
+    return register
+
+
+@kernel("Profile")
+def build_profile(section, length, start_angles, end_angles, combined):
+    """Build the profile solid from its section (SectionParams or face), its length and its bevels."""
+    face = make_section_face(section) if isinstance(section, SectionParams) else section
+
+    if not length:
+        return face
+
+    if any(start_angles) or any(end_angles):
+        return make_beveled_solid(face, length, start_angles, end_angles, combined)
+
+    return face.extrude(vec(0, 0, length))
+
+
+kernel("TrimmedProfile")(trim_shape)
+kernel("ExtrudedCutout")(extruded_cut)
+
+
+def is_frameforge_feature(obj):
+    return hasattr(getattr(obj, "Proxy", None), "get_build_inputs") and type(obj.Proxy).__name__ in KERNELS
+
+
+def pack(value):
+    """Convert shapes and vectors in 'value' to plain data, to send them to another process."""
+    if isinstance(value, Part.Shape):
+        return (BREP, value.exportBrepToString())
+    if isinstance(value, App.Vector):
+        return (VECTOR, value.x, value.y, value.z)
+    if isinstance(value, dict):
+        return {k: pack(v) for k, v in value.items()}
+    if isinstance(value, SectionParams):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(pack(v) for v in value)
+
+    return value
+
+
+def unpack(value):
+    """Reverse of pack()."""
+    if isinstance(value, tuple) and len(value) == 2 and value[0] == BREP:
+        shape = Part.Shape()
+        shape.importBrepFromString(value[1], False)
+        return shape
+    if isinstance(value, tuple) and len(value) == 4 and value[0] == VECTOR:
+        return vec(*value[1:])
+    if isinstance(value, dict):
+        return {k: unpack(v) for k, v in value.items()}
+    if isinstance(value, SectionParams):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(unpack(v) for v in value)
+
+    return value
+
+
+def run_task(task):
+    """
+    Worker entry point. 'task' is (object name, kernel name, packed inputs), returns (object name, packed shape,
+    error message).
+    """
+    name, kind, inputs = task
+    try:
+        shape = KERNELS[kind](**unpack(inputs))
+    except (Exception, FrameForgeException) as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+    return name, pack(shape), None
+
+
+def run_clash_task(task):
+    """
+    Worker entry point of the clash check. 'task' is (pairs of names, {name: packed shape}), returns (name a,
+    name b, common volume, error message) for each pair.
+    """
+    pairs, shapes = task
+    shapes = {name: unpack(shape) for name, shape in shapes.items()}
+
+    results = []
+    for a, b in pairs:
+        try:
+            results.append((a, b, shapes[a].common(shapes[b]).Volume, None))
+        except Exception as e:
+            results.append((a, b, 0.0, f"{type(e).__name__}: {e}"))
+
+    return results
@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import FreeCAD as App
+import FreeCADGui as Gui
+
+from freecad.frameforge.brep_cache import get_cache, input_digest
+from freecad.frameforge.ff_tools import ICONPATH, translate
+from freecad.frameforge.frameforge_exceptions import FrameForgeException
+from freecad.frameforge.kernels import KERNELS, is_frameforge_feature, pack, run_task, unpack
+
+
+def get_dependencies(obj):
+    """Objects whose shape is an input of 'obj'."""
+    links = []
+    if getattr(obj, "Target", None):
+        links.append(obj.Target[0])
+    if getattr(obj, "TrimmedBody", None):
+        links.append(obj.TrimmedBody)
+    for link in getattr(obj, "TrimmingBoundary", None) or []:
+        links.append(link[0])
+    if getattr(obj, "baseObject", None):
+        links.append(obj.baseObject[0])
+    links += getattr(obj, "Bodies", None) or []
+    if getattr(obj, "Sketch", None):
+        links.append(obj.Sketch)
+    if getattr(obj, "CustomProfile", None):
+        links.append(obj.CustomProfile)
+
+    return links
+
+
+def get_inputs(obj):
+    """Objects 'obj' is computed from: the links of a FrameForge feature, the out list of any other object."""
+    if is_frameforge_feature(obj):
+        return get_dependencies(obj)
+
+    return obj.OutList
+
+
+def get_build_objects(doc):
+    """FrameForge features of 'doc' and the objects they are computed from, directly or not."""
+    objects = {obj.Name: obj for obj in doc.Objects if is_frameforge_feature(obj)}
+    stack = list(objects.values())
+    while stack:
+        for dep in get_inputs(stack.pop()):
+            if dep.Document == doc and dep.Name not in objects:
+                objects[dep.Name] = dep
+                stack.append(dep)
+
+    return list(objects.values())
+
+
+def sort_in_levels(objects):
+    """
+    Sort objects by their inputs, in levels: objects of a level only depend on objects of the previous levels, so
+    they can be built independently.
+    """
+    by_name = {obj.Name: obj for obj in objects}
+    deps = {obj.Name: {d.Name for d in get_inputs(obj) if d.Name in by_name} for obj in objects}
+
+    levels = []
+    done = set()
+    while len(done) < len(deps):
+        level = [name for name, d in deps.items() if name not in done and d <= done]
+        if not level:
+            cycle = ", ".join(sorted(by_name[name].Label for name in deps if name not in done))
+            raise FrameForgeException(f"Dependency cycle between {cycle}")
+
+        levels.append([by_name[name] for name in level])
+        done.update(level)
+
+    return levels
+
+
+def get_worker_settings():
+    """Return the python executable used by the workers (None if not found) and the number of workers."""
+    param = App.ParamGet("User parameter:BaseApp/Preferences/Frameforge")
+    workers = param.GetInt("ParallelRebuildWorkers", os.cpu_count() or 1)
+
+    executable = param.GetString("ParallelRebuildPython", "")
+    if not executable:
+        # FreeCAD itself can't be used as interpreter, look for the python it is bundled with
+        bindir = os.path.join(App.getHomePath(), "bin")
+        candidates = [os.path.join(bindir, n) for n in ("python.exe", "python3", "python")] + [sys.executable]
+        executable = next((c for c in candidates if os.path.basename(c).startswith("python") and os.path.isfile(c)), "")
+
+    return executable or None, workers
+
+
+def make_pool(tasks_count):
+    """Return a process pool able to import FreeCAD and its size, or (None, 1) to build in this process."""
+    executable, workers = get_worker_settings()
+    workers = min(workers, tasks_count)
+    if executable is None or workers < 2:
+        return None, 1
+
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        ctx.set_executable(executable)
+        return ctx.Pool(workers), workers
+    except Exception as e:
+        App.Console.PrintWarning(f"FrameForge: can't start rebuild workers ({e}), building serially\n")
+        return None, 1
+
+
+def build_level(level, pool):
+    """Build the shapes of the features of a level, in the pool if any, and assign them."""
+    cache = get_cache()
+    keys = {}
+    cached = []
+    tasks = []
+    for obj in level:
+        try:
+            inputs = obj.Proxy.get_build_inputs(obj)
+        except (Exception, FrameForgeException) as e:
+            App.Console.PrintError(f"{obj.Label}: {e}\n")
+            continue
+
+        if inputs is None:
+            continue
+
+        kind = type(obj.Proxy).__name__
+        keys[obj.Name] = input_digest(kind, inputs)
+        shape = None
+        if cache is not None:
+            shape = cache.get(keys[obj.Name])
+
+        if shape is not None:
+            cached.append((obj.Name, shape, None))
+        else:
+            tasks.append((obj.Name, kind, inputs))
+
+    if pool is not None:
+        results = pool.map(run_task, [(name, kind, pack(inputs)) for name, kind, inputs in tasks])
+        results = [(name, unpack(shape), error) for name, shape, error in results]
+    else:
+        results = []
+        for name, kind, inputs in tasks:
+            try:
+                results.append((name, KERNELS[kind](**inputs), None))
+            except (Exception, FrameForgeException) as e:
+                results.append((name, None, f"{type(e).__name__}: {e}"))
+
+    if cache is not None:
+        for name, shape, error in results:
+            if error is None:
+                cache.put(keys[name], shape)
+    results += cached
+
+    doc = level[0].Document
+    for name, shape, error in results:
+        obj = doc.getObject(name)
+        if error is not None:
+            App.Console.PrintError(f"{obj.Label}: {error}\n")
+            continue
+
+        obj.Proxy.apply_shape(obj, shape)
+        # the next recompute of the feature finds its inputs unchanged, for the features checking them
+        if hasattr(obj.Proxy, "built_digest"):
+            obj.Proxy.built_digest = keys[name]
+
+    return len(results)
+
+
+def recompute_inputs(level, rebuilt):
+    """
+    Recompute the objects of a level that are not FrameForge features (sketches, lines...) if they are touched or
+    computed from a rebuilt object, e.g. a sketch attached to a face of a profile. Return the recomputed objects.
+    """
+    recomputed = []
+    for obj in level:
+        if obj.isTouched() or any(dep.Name in rebuilt for dep in obj.OutList):
+            obj.recompute(True)
+            recomputed.append(obj)
+
+    return recomputed
+
+
+def parallel_rebuild(doc):
+    objects = get_build_objects(doc)
+    features = [obj for obj in objects if is_frameforge_feature(obj)]
+    if not features:
+        return
+
+    start = time.perf_counter()
+    levels = sort_in_levels(objects)
+
+    pool, workers = make_pool(max(len([obj for obj in level if is_frameforge_feature(obj)]) for level in levels))
+    built = 0
+    rebuilt = set()
+    try:
+        for level in levels:
+            # the inputs of the features are recomputed in the order of the levels, on top of the features they use
+            others = [obj for obj in level if not is_frameforge_feature(obj)]
+            rebuilt.update(obj.Name for obj in recompute_inputs(others, rebuilt))
+
+            level = [obj for obj in level if is_frameforge_feature(obj)]
+            if level:
+                built += build_level(level, pool)
+                rebuilt.update(obj.Name for obj in level)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # shapes are assigned, the features don't need to be executed again, but what uses them does
+    for obj in features:
+        obj.purgeTouched()
+        for user in obj.InList:
+            if not is_frameforge_feature(user) and user.Name not in rebuilt:
+                user.touch()
+    doc.recompute()
+
+    App.Console.PrintMessage(
+        f"FrameForge: rebuilt {built} features in {len(levels)} levels with {workers} process(es), "
+        f"{time.perf_counter() - start:.2f}s\n"
+    )
+
+
+class ParallelRebuildCommand:
+    def GetResources(self):
+        return {
+            "Pixmap": os.path.join(ICONPATH, "parallel-rebuild.svg"),
+            "MenuText": translate("FrameForge", "Parallel rebuild"),
+            "ToolTip": translate(
+                "FrameForge",
+                "<html><head/><body><p><b>Rebuild all FrameForge objects</b> \
+                    <br><br> \
+                    Independent profiles, trims and cutouts are built in parallel processes. \
+                    </p></body></html>",
+            ),
+        }
+
+    def IsActive(self):
+        return bool(App.ActiveDocument)
+
+    def Activated(self):
+        try:
+            parallel_rebuild(App.ActiveDocument)
+        except FrameForgeException as e:
+            App.Console.PrintError(f"Error: {e}\n")
+
+
+Gui.addCommand("FrameForge_ParallelRebuild", ParallelRebuildCommand())
@@ -0,0 +1,478 @@
+import math
+from collections import namedtuple
+
+import FreeCAD as App
+import numpy as np
+import Part
+
+from freecad.frameforge.extrusions import load_series, series_face
+from freecad.frameforge.ff_tools import LRUCache
+
+vec = App.Base.Vector
+
+# A section is described by a list of loops (outer boundary first, then holes). A loop is a (n, 6) array of
+# segments, in wire order:
+#   LINE: (LINE, x0, y0, x1, y1, 0)
+#   ARC:  (ARC, cx, cy, radius, angle0, angle1)   angles in degrees, as for Part.makeCircle
+LINE = 0
+ARC = 1
+
+SectionParams = namedtuple(
+    "SectionParams",
+    [
+        "family",
+        "width",
+        "height",
+        "thickness",
+        "thickness_flange",
+        "radius_large",
+        "radius_small",
+        "make_fillet",
+        "centered_on_height",
+        "centered_on_width",
+        "flange_angle",
+        "upn",
+        "ipn",
+    ],
+)
+
+
+def section_params(obj):
+    """Return the SectionParams that fully define the cross-section of a Profile object."""
+    return SectionParams(
+        obj.Family,
+        obj.ProfileWidth,
+        obj.ProfileHeight,
+        obj.Thickness,
+        obj.ThicknessFlange,
+        obj.RadiusLarge,
+        obj.RadiusSmall,
+        obj.MakeFillet,
+        obj.CenteredOnHeight,
+        obj.CenteredOnWidth,
+        getattr(obj, "FlangeAngle", None),
+        getattr(obj, "UPN", None),
+        getattr(obj, "IPN", None),
+    )
+
+
+# Cross-section faces shared by every profile of the process
+SECTION_CACHE_SIZE = 256
+section_cache = LRUCache(SECTION_CACHE_SIZE)
+
+# family name -> generator(params, w, h), returning a list of loops (or a Part.Face for the slot extrusions)
+SECTION_GENERATORS = {}
+
+
+def section_generator(*families):
+    def register(func):
+        for family in families:
+            SECTION_GENERATORS[family] = func
+        return func
+
+    return register
+
+
+def make_section_face(params):
+    """Return the cross-section face for 'params', from the cache when possible."""
+    face = section_cache.get(params)
+    if face is None:
+        face = build_section(params)
+        section_cache.put(params, face)
+
+    return face
+
+
+def build_section(params):
+    if params.family not in SECTION_GENERATORS:
+        raise ValueError(f"Unknown profile family: {params.family}")
+
+    w = -params.width / 2 if params.centered_on_width else 0
+    h = -params.height / 2 if params.centered_on_height else 0
+
+    section = SECTION_GENERATORS[params.family](params, w, h)
+    if isinstance(section, Part.Shape):
+        return section
+
+    return build_face(section)
+
+
+def build_face(loops):
+    """Build the face of a section from its loops, the first one being the outer boundary."""
+    wires = [build_wire(loop) for loop in loops]
+    if len(wires) == 1:
+        return Part.Face(wires[0])
+
+    return Part.makeFace(wires, "Part::FaceMakerBullseye")
+
+
+def build_wire(loop):
+    d = vec(0, 0, 1)
+    edges = []
+    for kind, a, b, c, e, f in loop.tolist():
+        if kind == LINE:
+            edges.append(Part.makeLine(vec(a, b, 0), vec(c, e, 0)))
+        else:
+            edges.append(Part.makeCircle(c, vec(a, b, 0), d, e, f))
+
+    return Part.Wire(edges)
+
+
+# ************************************************************************************************
+# table helpers
+def line(p, q):
+    return np.array([LINE, p[0], p[1], q[0], q[1], 0.0])
+
+
+def arc(c, radius, a0, a1):
+    return np.array([ARC, c[0], c[1], radius, a0, a1])
+
+
+def loop(*segments):
+    return np.vstack(segments)
+
+
+def polygon(points):
+    """Closed loop of lines through 'points', a (n, 2) array."""
+    n = len(points)
+    return np.column_stack([np.full(n, LINE), points, np.roll(points, -1, axis=0), np.zeros(n)])
+
+
+def rounded_rectangle(x0, y0, x1, y1, radius):
+    p = np.array(
+        [
+            (x0, y0 + radius),
+            (x0, y1 - radius),
+            (x0 + radius, y1),
+            (x1 - radius, y1),
+            (x1, y1 - radius),
+            (x1, y0 + radius),
+            (x1 - radius, y0),
+            (x0 + radius, y0),
+        ]
+    )
+    c = np.array(
+        [
+            (x0 + radius, y0 + radius),
+            (x0 + radius, y1 - radius),
+            (x1 - radius, y1 - radius),
+            (x1 - radius, y0 + radius),
+        ]
+    )
+    return loop(
+        line(p[0], p[1]),
+        arc(c[1], radius, 90, 180),
+        line(p[2], p[3]),
+        arc(c[2], radius, 0, 90),
+        line(p[4], p[5]),
+        arc(c[3], radius, 270, 0),
+        line(p[6], p[7]),
+        arc(c[0], radius, 180, 270),
+    )
+
+
+def mirror_x(points, W):
+    return np.column_stack([W - points[:, 0], points[:, 1]])
+
+
+# ************************************************************************************************
+# generators
+@section_generator("Equal Leg Angles", "Unequal Leg Angles")
+def angle_section(s, w, h):
+    W, H, TW, R, r = s.width, s.height, s.thickness, s.radius_large, s.radius_small
+    o = (w, h)
+
+    if not s.make_fillet:
+        return [polygon(np.array([(0, 0), (0, H), (TW, H), (TW, TW), (W, TW), (W, 0)]) + o)]
+
+    p = (
+        np.array(
+            [
+                (0, 0),
+                (0, H),
+                (TW - r, H),
+                (TW, H - r),
+                (TW, TW + R),
+                (TW + R, TW),
+                (W - r, TW),
+                (W, TW - r),
+                (W, 0),
+            ]
+        )
+        + o
+    )
+    c = np.array([(TW - r, H - r), (TW + R, TW + R), (W - r, TW - r)]) + o
+
+    return [
+        loop(
+            line(p[0], p[1]),
+            line(p[1], p[2]),
+            arc(c[0], r, 0, 90),
+            line(p[3], p[4]),
+            arc(c[1], R, 180, 270),
+            line(p[5], p[6]),
+            arc(c[2], r, 0, 90),
+            line(p[7], p[8]),
+            line(p[8], p[0]),
+        )
+    ]
+
+
+@section_generator("Flat Sections", "Square")
+def rectangle_section(s, w, h):
+    W, H = s.width, s.height
+    return [polygon(np.array([(0, 0), (0, H), (W, H), (W, 0)]) + (w, h))]
+
+
+@section_generator("Square Hollow", "Rectangular Hollow")
+def hollow_section(s, w, h):
+    W, H, TW, R, r = s.width, s.height, s.thickness, s.radius_large, s.radius_small
+
+    if not s.make_fillet:
+        return [
+            polygon(np.array([(0, 0), (0, H), (W, H), (W, 0)]) + (w, h)),
+            polygon(np.array([(TW, TW), (TW, H - TW), (W - TW, H - TW), (W - TW, TW)]) + (w, h)),
+        ]
+
+    return [
+        rounded_rectangle(w, h, W + w, H + h, R),
+        rounded_rectangle(TW + w, TW + h, W - TW + w, H - TW + h, r),
+    ]
+
+
+@section_generator("UPE", "UPN")
+def channel_section(s, w, h):
+    W, H, TW, TF, R, r = s.width, s.height, s.thickness, s.thickness_flange, s.radius_large, s.radius_small
+    o = (w, h)
+
+    if not s.make_fillet:
+        Yd = (W / 4) * math.tan(math.pi * s.flange_angle / 180) if s.upn else 0
+        return [
+            polygon(
+                np.array(
+                    [
+                        (0, 0),
+                        (0, H),
+                        (W, H),
+                        (W, 0),
+                        (W + Yd - TW, 0),
+                        (W - Yd - TW, H - TF),
+                        (TW + Yd, H - TF),
+                        (TW - Yd, 0),
+                    ]
+                )
+                + o
+            )
+        ]
+
+    if not s.upn:  # UPE with fillets
+        left = np.array([(TW + R, H - TF), (TW, H - TF - R), (TW, r), (TW - r, 0)])
+        lc = np.array([(TW - r, r), (TW + R, H - TF - R)])
+        a_small, a_large = (270, 0), (90, 180)
+        a_small_r, a_large_r = (180, 270), (0, 90)
+
+    else:  # UPN with fillets
+        ang = s.flange_angle
+        angrad = math.pi * ang / 180
+        sina, cosa, tana = math.sin(angrad), math.cos(angrad), math.tan(angrad)
+
+        cot1 = r * sina
+        cot2 = (H / 2 - r) * tana
+        cot3 = cot1 * tana
+        cot8 = (H / 2 - R - TF + R * sina) * tana
+
+        left = np.array(
+            [
+                (cot8 + R * cosa + TW, H - TF),
+                (TW + cot8, H - TF - R + R * sina),
+                (TW - cot2 - cot3, r - cot1),
+                (TW - cot2 - cot3 - r * cosa, 0),
+            ]
+        )
+        lc = np.array([(TW - cot2 - cot3 - r * cosa, r), (cot8 + R * cosa + TW, H - TF - R)])
+        a_small, a_large = (270, 0 - ang), (90, 180 - ang)
+        a_small_r, a_large_r = (180 + ang, 270), (0 + ang, 90)
+
+    # the right side of the web is the mirror of the left one
+    p = np.vstack([np.array([(0, 0), (0, H), (W, H), (W, 0)]), mirror_x(left[::-1], W), left]) + o
+    c = np.vstack([lc, mirror_x(lc, W)]) + o
+
+    return [
+        loop(
+            line(p[0], p[1]),
+            line(p[1], p[2]),
+            line(p[2], p[3]),
+            line(p[3], p[4]),
+            arc(c[2], r, *a_small_r),
+            line(p[5], p[6]),
+            arc(c[3], R, *a_large_r),
+            line(p[7], p[8]),
+            arc(c[1], R, *a_large),
+            line(p[9], p[10]),
+            arc(c[0], r, *a_small),
+            line(p[11], p[0]),
+        )
+    ]
+
+
+@section_generator("IPE", "IPN", "HEA", "HEB", "HEM")
+def beam_section(s, w, h):
+    W, H, TW, TF, R, r = s.width, s.height, s.thickness, s.thickness_flange, s.radius_large, s.radius_small
+    o = (w, h)
+
+    XA1 = W / 2 - TW / 2  # face gauche du web
+    XA2 = W / 2 + TW / 2  # face droite du web
+
+    if not s.make_fillet:
+        Yd = (W / 4) * math.tan(math.pi * s.flange_angle / 180) if s.ipn else 0
+        return [
+            polygon(
+                np.array(
+                    [
+                        (0, 0),
+                        (0, TF - Yd),
+                        (XA1, TF + Yd),
+                        (XA1, H - TF - Yd),
+                        (0, H - TF + Yd),
+                        (0, H),
+                        (W, H),
+                        (W, H - TF + Yd),
+                        (XA2, H - TF - Yd),
+                        (XA2, TF + Yd),
+                        (W, TF - Yd),
+                        (W, 0),
+                    ]
+                )
+                + o
+            )
+        ]
+
+    if not s.ipn:  # IPE avec arrondis
+        p = (
+            np.array(
+                [
+                    (0, 0),
+                    (0, TF),
+                    (XA1 - R, TF),
+                    (XA1, TF + R),
+                    (XA1, H - TF - R),
+                    (XA1 - R, H - TF),
+                    (0, H - TF),
+                    (0, H),
+                    (W, H),
+                    (W, H - TF),
+                    (XA2 + R, H - TF),
+                    (XA2, H - TF - R),
+                    (XA2, TF + R),
+                    (XA2 + R, TF),
+                    (W, TF),
+                    (W, 0),
+                ]
+            )
+            + o
+        )
+        c = (
+            np.array(
+                [
+                    (XA1 - R, TF + R),
+                    (XA1 - R, H - TF - R),
+                    (XA2 + R, H - TF - R),
+                    (XA2 + R, TF + R),
+                ]
+            )
+            + o
+        )
+
+        return [
+            loop(
+                line(p[0], p[1]),
+                line(p[1], p[2]),
+                arc(c[0], R, 270, 0),
+                line(p[3], p[4]),
+                arc(c[1], R, 0, 90),
+                line(p[5], p[6]),
+                line(p[6], p[7]),
+                line(p[7], p[8]),
+                line(p[8], p[9]),
+                line(p[9], p[10]),
+                arc(c[2], R, 90, 180),
+                line(p[11], p[12]),
+                arc(c[3], R, 180, 270),
+                line(p[13], p[14]),
+                line(p[14], p[15]),
+                line(p[15], p[0]),
+            )
+        ]
+
+    # IPN avec arrondis
+    ang = s.flange_angle
+    angrad = math.pi * ang / 180
+    sina, cosa, tana = math.sin(angrad), math.cos(angrad), math.tan(angrad)
+    cot1 = W / 4 * tana
+    cot2 = TF - cot1
+    cot3 = r * cosa
+    cot4 = r - cot3 * tana
+    cot5 = cot2 + cot4 * tana
+    cot6 = R * sina
+    cot7 = W / 4 - R - TW / 2
+    cot8 = cot6 + cot7
+    cot9 = cot7 * tana
+    cot10 = R * cosa
+
+    # lower left quarter, the three others are mirrored
+    q = np.array([(0, cot5 - cot3), (cot4, cot5), (W / 4 + cot8, TF + cot9), (W / 2 - TW / 2, cot9 + TF + cot10)])
+    qc = np.array([(r, cot5 - cot3), (W / 2 - TW / 2 - R, cot9 + TF + cot10)])
+
+    upper = np.column_stack([q[:, 0], H - q[:, 1]])[::-1]
+    left = np.vstack([[(0, 0)], q, upper, [(0, H)]])
+    p = np.vstack([left, [(W, H)], mirror_x(left[1:-1], W)[::-1], [(W, 0)]]) + o
+
+    upper_c = np.column_stack([qc[:, 0], H - qc[:, 1]])[::-1]
+    left_c = np.vstack([qc, upper_c])
+    c = np.vstack([left_c, mirror_x(left_c, W)[::-1]]) + o
+
+    return [
+        loop(
+            line(p[0], p[1]),
+            arc(c[0], r, 90 + ang, 180),
+            line(p[2], p[3]),
+            arc(c[1], R, 270 + ang, 0),
+            line(p[4], p[5]),
+            arc(c[2], R, 0, 90 - ang),
+            line(p[6], p[7]),
+            arc(c[3], r, 180, 270 - ang),
+            line(p[8], p[9]),
+            line(p[9], p[10]),
+            line(p[10], p[11]),
+            arc(c[4], r, 270 + ang, 0),
+            line(p[12], p[13]),
+            arc(c[5], R, 90 + ang, 180),
+            line(p[14], p[15]),
+            arc(c[6], R, 180, 270 - ang),
+            line(p[16], p[17]),
+            arc(c[7], r, 0, 90 - ang),
+            line(p[18], p[19]),
+            line(p[19], p[0]),
+        )
+    ]
+
+
+@section_generator("Round Bar")
+def round_bar_section(s, w, h):
+    H = s.height
+    c = (H / 2 + h, H / 2 + h)
+    return [loop(arc(c, H / 2, 0, 360))]
+
+
+@section_generator("Pipe")
+def pipe_section(s, w, h):
+    H, TW = s.height, s.thickness
+    c = (H / 2 + h, H / 2 + h)
+    return [loop(arc(c, H / 2, 0, 360)), loop(arc(c, H / 2 - TW, 0, 360))]
+
+
+# ************************************************************************************************
+# slot extrusions, built from the series of aluminium_extrusion.json
+@section_generator(*load_series())
+def slot_section(s, w, h):
+    return series_face(s.family, s.width, s.height)
@@ -0,0 +1,91 @@
+import csv
+import os
+import re
+import tempfile
+
+import FreeCAD as App
+
+# Spreadsheet contents gathered in memory and written in one batch. Setting the cells one by one goes through the
+# property machinery of the sheet for every cell; importing a file sets all of them in a single call.
+
+ADDRESS = re.compile(r"^([A-Z]+)([0-9]+)$")
+
+
+def column_index(letters):
+    """0-based index of a column name (A, B, ..., Z, AA, ...)."""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def column_name(index):
+    letters = ""
+    index += 1
+    while index > 0:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return letters
+
+
+class SheetWriter(object):
+    """Cells of a spreadsheet, set like Spreadsheet::Sheet.set() and written by write()."""
+
+    def __init__(self):
+        self.cells = {}
+
+    def set(self, address, content):
+        match = ADDRESS.match(address)
+        if match is None:
+            raise ValueError(f"Invalid cell address: {address}")
+
+        self.cells[(int(match.group(2)) - 1, column_index(match.group(1)))] = str(content)
+
+    def rows(self):
+        """Cell contents as a list of rows, empty strings for the empty cells."""
+        if not self.cells:
+            return []
+
+        rows = [[""] * (max(c for _, c in self.cells) + 1) for _ in range(max(r for r, _ in self.cells) + 1)]
+        for (r, c), content in self.cells.items():
+            rows[r][c] = content
+        return rows
+
+    def write(self, sheet):
+        """
+        Write the cells to 'sheet' by importing them from a temporary tab separated file. The cells the import can't
+        carry (tabs, line breaks, backslashes), or all of them if the import fails, are set one by one.
+        """
+        bulk = {}
+        single = {}
+        for key, content in self.cells.items():
+            if any(c in content for c in "\t\n\r\\"):
+                single[key] = content
+            else:
+                bulk[key] = content
+
+        if bulk and not self.import_cells(sheet, bulk):
+            single.update(bulk)
+
+        for (r, c), content in single.items():
+            sheet.set(f"{column_name(c)}{r + 1}", content)
+
+    def import_cells(self, sheet, cells):
+        writer = SheetWriter()
+        writer.cells = cells
+
+        fd, path = tempfile.mkstemp(suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                # the sheet reader takes quotes escaped by a backslash, not doubled
+                csv.writer(
+                    f, delimiter="\t", quotechar='"', escapechar="\\", doublequote=False, lineterminator="\n"
+                ).writerows(writer.rows())
+            sheet.importFile(path, "\t", '"', "\\")
+        except Exception as e:
+            App.Console.PrintWarning(f"FrameForge: spreadsheet import failed, setting the cells one by one ({e})\n")
+            return False
+        finally:
+            os.remove(path)
+
+        return True
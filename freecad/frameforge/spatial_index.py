@@ -0,0 +1,308 @@
+import math
+from collections import defaultdict
+
+import FreeCAD as App
+
+from freecad.frameforge.kernels import is_frameforge_feature
+
+# Document level spatial index of the FrameForge features: a uniform grid of their bounding boxes, with the axis
+# (Target edge) of the member they are built on. It is built on first use and kept up to date by a document
+# observer, so neighbour queries don't have to scan all the objects of the document.
+
+# cell size used when the document has no member to choose one from
+DEFAULT_CELL_SIZE = 100.0
+
+
+def member_axis(obj):
+    """Return the (start, end) points of the Target edge of the profile 'obj' is built on, or None."""
+    while obj is not None:
+        if getattr(obj, "Target", None):
+            edge = obj.Target[0].getSubObject(obj.Target[1][0])
+            return edge.Vertexes[0].Point, edge.Vertexes[-1].Point
+        elif hasattr(obj, "TrimmedBody"):
+            obj = obj.TrimmedBody
+        elif getattr(obj, "baseObject", None):
+            obj = obj.baseObject[0]
+        else:
+            return None
+
+    return None
+
+
+def box_distance(point, bbox):
+    """Distance from 'point' to the bounding box, 0 inside."""
+    dx = max(bbox.XMin - point.x, 0.0, point.x - bbox.XMax)
+    dy = max(bbox.YMin - point.y, 0.0, point.y - bbox.YMax)
+    dz = max(bbox.ZMin - point.z, 0.0, point.z - bbox.ZMax)
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def segment_box_entry(start, end, bbox):
+    """Position (0 to 1) where the segment enters the bounding box, or None if it misses it (slab test)."""
+    t0, t1 = 0.0, 1.0
+    for p, q, lo, hi in (
+        (start.x, end.x, bbox.XMin, bbox.XMax),
+        (start.y, end.y, bbox.YMin, bbox.YMax),
+        (start.z, end.z, bbox.ZMin, bbox.ZMax),
+    ):
+        d = q - p
+        if d == 0:
+            if p < lo or p > hi:
+                return None
+            continue
+
+        a, b = (lo - p) / d, (hi - p) / d
+        if a > b:
+            a, b = b, a
+        t0, t1 = max(t0, a), min(t1, b)
+        if t0 > t1:
+            return None
+
+    return t0
+
+
+class SpatialIndex(object):
+    """
+    Uniform grid of bounding boxes, by object name. The axes of the members are in a second grid, by the bounding
+    box of the segment: they are known even when the shape is not built yet, or doesn't hold the axis.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.boxes = {}
+        self.axes = {}
+        self._cells = defaultdict(set)
+        self._keys = {}
+        self._axis_cells = defaultdict(set)
+        self._axis_keys = {}
+        # occupied cells range, to stop the nearest search
+        self._lower = None
+        self._upper = None
+
+    def _cell(self, x, y, z):
+        s = self.cell_size
+        return (math.floor(x / s), math.floor(y / s), math.floor(z / s))
+
+    def _box_keys(self, bbox):
+        lo = self._cell(bbox.XMin, bbox.YMin, bbox.ZMin)
+        hi = self._cell(bbox.XMax, bbox.YMax, bbox.ZMax)
+        return [
+            (i, j, k) for i in range(lo[0], hi[0] + 1) for j in range(lo[1], hi[1] + 1) for k in range(lo[2], hi[2] + 1)
+        ]
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __contains__(self, name):
+        return name in self.boxes
+
+    def insert(self, name, bbox, axis=None):
+        self._remove_box(name)
+
+        keys = self._box_keys(bbox)
+        for key in keys:
+            self._cells[key].add(name)
+        self._keys[name] = keys
+        self.boxes[name] = bbox
+        if axis is not None:
+            self.insert_axis(name, axis)
+
+        lo, hi = keys[0], keys[-1]
+        if self._lower is None:
+            self._lower, self._upper = lo, hi
+        else:
+            self._lower = tuple(map(min, self._lower, lo))
+            self._upper = tuple(map(max, self._upper, hi))
+
+    def insert_axis(self, name, axis):
+        self.remove_axis(name)
+
+        bbox = App.BoundBox()
+        bbox.add(axis[0])
+        bbox.add(axis[1])
+        keys = self._box_keys(bbox)
+        for key in keys:
+            self._axis_cells[key].add(name)
+        self._axis_keys[name] = keys
+        self.axes[name] = axis
+
+    def remove(self, name):
+        self._remove_box(name)
+        self.remove_axis(name)
+
+    def _remove_box(self, name):
+        _discard(self._cells, self._keys.pop(name, ()), name)
+        self.boxes.pop(name, None)
+
+    def remove_axis(self, name):
+        _discard(self._axis_cells, self._axis_keys.pop(name, ()), name)
+        self.axes.pop(name, None)
+
+    def update_object(self, obj):
+        """Insert, move or remove 'obj' according to its current shape and axis."""
+        try:
+            axis = member_axis(obj)
+        except Exception:
+            axis = None
+        if axis is not None:
+            self.insert_axis(obj.Name, axis)
+        else:
+            self.remove_axis(obj.Name)
+
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            self._remove_box(obj.Name)
+        else:
+            self.insert(obj.Name, shape.BoundBox)
+
+    def axes_overlapping(self, bbox, margin=0.0):
+        """Names of the objects whose axis segment bounding box overlaps 'bbox' enlarged by 'margin'."""
+        bbox = App.BoundBox(bbox)
+        bbox.enlarge(margin)
+
+        names = set()
+        for key in self._box_keys(bbox):
+            names.update(self._axis_cells.get(key, ()))
+
+        result = []
+        for name in names:
+            axis_bbox = App.BoundBox()
+            axis_bbox.add(self.axes[name][0])
+            axis_bbox.add(self.axes[name][1])
+            if axis_bbox.intersect(bbox):
+                result.append(name)
+        return result
+
+    def overlapping(self, bbox, margin=0.0):
+        """Names of the objects whose bounding box overlaps 'bbox' enlarged by 'margin'."""
+        bbox = App.BoundBox(bbox)
+        bbox.enlarge(margin)
+
+        names = set()
+        for key in self._box_keys(bbox):
+            names.update(self._cells.get(key, ()))
+
+        return [name for name in names if self.boxes[name].intersect(bbox)]
+
+    def nearest(self, point, count=1, exclude=()):
+        """
+        The 'count' objects whose bounding box is the closest to 'point', as sorted (distance, name) tuples. The
+        cells are searched in rings around the cell of the point, until no closer object can be found.
+        """
+        if not self.boxes:
+            return []
+
+        center = self._cell(point.x, point.y, point.z)
+        last_ring = max(max(abs(c - lo), abs(hi - c)) for c, lo, hi in zip(center, self._lower, self._upper))
+
+        found = {}
+        ring = 0
+        while ring <= last_ring:
+            for key in self._ring(center, ring):
+                for name in self._cells.get(key, ()):
+                    if name not in found and name not in exclude:
+                        found[name] = box_distance(point, self.boxes[name])
+
+            best = sorted((d, n) for n, d in found.items())[:count]
+            # objects not found yet are at least 'ring' cells away
+            if len(best) == count and best[-1][0] <= ring * self.cell_size:
+                return best
+            ring += 1
+
+        return sorted((d, n) for n, d in found.items())[:count]
+
+    def _ring(self, center, ring):
+        x, y, z = center
+        for i in range(x - ring, x + ring + 1):
+            for j in range(y - ring, y + ring + 1):
+                for k in range(z - ring, z + ring + 1):
+                    if max(abs(i - x), abs(j - y), abs(k - z)) == ring:
+                        yield (i, j, k)
+
+    def segment_hits(self, start, end):
+        """Objects whose bounding box is crossed by the segment, as (position from 0 to 1, name) tuples sorted by
+        position."""
+        bbox = App.BoundBox()
+        bbox.add(start)
+        bbox.add(end)
+        hits = []
+        for name in self.overlapping(bbox):
+            t = segment_box_entry(start, end, self.boxes[name])
+            if t is not None:
+                hits.append((t, name))
+
+        return sorted(hits)
+
+    def ray_hits(self, origin, direction, length):
+        """Objects whose bounding box is crossed by the ray, up to 'length', as sorted (distance, name) tuples."""
+        direction = App.Vector(direction).normalize()
+        return [(t * length, name) for t, name in self.segment_hits(origin, origin + direction * length)]
+
+
+def _discard(cells, keys, name):
+    for key in keys:
+        cell = cells[key]
+        cell.discard(name)
+        if not cell:
+            del cells[key]
+
+
+def choose_cell_size(objects):
+    """Median of the largest bounding box dimension of the objects: most members span a few cells."""
+    sizes = sorted(
+        max(obj.Shape.BoundBox.XLength, obj.Shape.BoundBox.YLength, obj.Shape.BoundBox.ZLength)
+        for obj in objects
+        if not obj.Shape.isNull()
+    )
+    if not sizes or sizes[len(sizes) // 2] == 0:
+        return DEFAULT_CELL_SIZE
+
+    return sizes[len(sizes) // 2]
+
+
+def build_index(doc):
+    objects = [obj for obj in doc.Objects if is_frameforge_feature(obj)]
+    index = SpatialIndex(choose_cell_size(objects))
+    for obj in objects:
+        index.update_object(obj)
+
+    return index
+
+
+class IndexObserver(object):
+    """Keep the indexes of the documents up to date."""
+
+    def slotChangedObject(self, obj, prop):
+        # an attached profile is moved by positionBySupport() after its shape is set, without a Shape signal
+        if prop in ("Shape", "Placement", "Target") and is_frameforge_feature(obj):
+            index = _indexes.get(obj.Document.Name)
+            if index is not None:
+                index.update_object(obj)
+
+    def slotDeletedObject(self, obj):
+        index = _indexes.get(obj.Document.Name)
+        if index is not None:
+            index.remove(obj.Name)
+
+    def slotDeletedDocument(self, doc):
+        _indexes.pop(doc.Name, None)
+
+
+# document name -> SpatialIndex
+_indexes = {}
+_observer = None
+
+
+def get_index(doc):
+    """Return the spatial index of 'doc', built on the first call."""
+    global _observer
+
+    if _observer is None:
+        _observer = IndexObserver()
+        App.addDocumentObserver(_observer)
+
+    index = _indexes.get(doc.Name)
+    if index is None:
+        index = _indexes[doc.Name] = build_index(doc)
+
+    return index
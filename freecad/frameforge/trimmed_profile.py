@@ -2,17 +2,58 @@ import glob
 import math
 import os
 
-import ArchCommands
-import BOPTools.SplitAPI
 import FreeCAD as App
 import FreeCADGui as Gui
 import Part
 from PySide import QtCore, QtGui
 
+from freecad.frameforge.brep_cache import cached_build, input_digest
+from freecad.frameforge.cope import axes_angle, export_template, largest_cylinder
+from freecad.frameforge.cuts import BOUNDARY_MARGIN, local_boundaries
 from freecad.frameforge.ff_tools import ICONPATH, PROFILEIMAGES_PATH, PROFILESPATH, UIPATH, translate
+from freecad.frameforge.joints import miter_plane
+from freecad.frameforge.spatial_index import member_axis
+
+CUT_TYPES = [
+    "Perfect fit",
+    "Simple fit",
+    "Tube cope",
+]
+
+
+# bevel angles of a profile, in degrees
+BEVEL_ANGLES = ["BevelStartCut1", "BevelStartCut2", "BevelEndCut1", "BevelEndCut2", "BevelStartCut", "BevelEndCut"]
+
+
+def section_reach(obj):
+    """
+    Return how far the profile 'obj' is built on reaches from its Target edge ends: the diagonal of its section (the
+    edge may lie on a corner of the section), the overhang of its bevels and its offsets. None if 'obj' isn't built
+    on a FrameForge profile or is built on a custom profile, whose sketch doesn't set the section size.
+    """
+    while obj is not None:
+        if getattr(obj, "CustomProfile", None):
+            return None
+        elif hasattr(obj, "ProfileWidth") and hasattr(obj, "ProfileHeight"):
+            diagonal = math.hypot(obj.ProfileWidth, obj.ProfileHeight)
+            bevel = max([abs(getattr(obj, p, 0.0)) for p in BEVEL_ANGLES], default=0.0)
+            overhang = diagonal * math.tan(math.radians(min(bevel, 89.0)))
+            offset = max(abs(getattr(obj, "OffsetA", 0.0)), abs(getattr(obj, "OffsetB", 0.0)))
+            return diagonal + overhang + offset
+        elif hasattr(obj, "TrimmedBody"):
+            obj = obj.TrimmedBody
+        elif getattr(obj, "baseObject", None):
+            obj = obj.baseObject[0]
+        else:
+            return None
+
+    return None
 
 
 class TrimmedProfile:
+    # input_digest of the last built shape, set by execute and by the parallel rebuild
+    built_digest = None
+
     def __init__(self, obj):
         obj.addProperty(
             "App::PropertyLink", "TrimmedBody", "TrimmedProfile", translate("App::Property", "Body to be trimmed")
@@ -32,119 +73,195 @@ class TrimmedProfile:
         ).TrimmedProfileType = ["End Trim", "End Miter"]
         obj.addProperty(
             "App::PropertyEnumeration", "CutType", "TrimmedProfile", translate("App::Property", "Cut Type")
-        ).CutType = [
-            "Perfect fit",
-            "Simple fit",
-        ]
+        ).CutType = CUT_TYPES
+        self.add_fuzzy_tolerance(obj)
+        self.add_cope_template(obj)
 
         obj.Proxy = self
 
+    def add_fuzzy_tolerance(self, obj):
+        obj.addProperty(
+            "App::PropertyFloat",
+            "FuzzyTolerance",
+            "TrimmedProfile",
+            translate("App::Property", "Fuzzy value of the trim boolean operation, 0 for an exact one"),
+        ).FuzzyTolerance = 0.0
+
+    def add_cope_template(self, obj):
+        obj.addProperty(
+            "App::PropertyFile",
+            "CopeTemplate",
+            "TrimmedProfile",
+            translate("App::Property", "SVG or DXF file the unrolled Tube cope template is written to, if set"),
+        ).CopeTemplate = ""
+
     def onChanged(self, fp, prop):
-        pass
+        # the template doesn't change the shape, the trim isn't rebuilt when only its path is set
+        if prop == "CopeTemplate" and "Restoring" not in fp.State:
+            self.export_cope_template(fp)
 
     def execute(self, fp):
         """Print a short message when doing a recomputation, this method is mandatory"""
         App.Console.PrintMessage("Recompute {}\n".format(fp.Name))
-        # TODO: Put these methods in proper functions
-        if fp.TrimmedBody is None:
+        self.run_compatibility_migrations(fp)
+        inputs = self.get_build_inputs(fp)
+        if inputs is None:
             return
-        if len(fp.TrimmingBoundary) == 0:
+
+        # the trim is unchanged if its inputs are, even if a linked object was recomputed
+        key = input_digest("TrimmedProfile", inputs)
+        if key == self.built_digest and not fp.Shape.isNull():
             return
 
-        cut_shapes = []
+        self.apply_shape(fp, cached_build("TrimmedProfile", inputs, key))
+        self.built_digest = key
+
+    def get_build_inputs(self, fp):
+        """
+        Return the arguments of cuts.trim_shape, or None if the trim is not defined yet.
+
+        A trim of a trimmed profile doesn't cut the shape of the previous trim: the cut tools of the whole chain
+        are gathered and the base body is cut once.
+        """
+        if fp.TrimmedBody is None:
+            return None
+        if len(fp.TrimmingBoundary) == 0:
+            return None
+
+        chain = [fp]
+        base = fp.TrimmedBody
+        while hasattr(base, "TrimmedProfileType"):
+            chain.append(base)
+            base = base.TrimmedBody
+        if base is None:
+            return None
+        if hasattr(getattr(base, "Proxy", None), "get_bodies") and len(base.Proxy.get_bodies(base)) > 1:
+            raise RuntimeError(f"{base.Label} cuts several bodies, trim them before the cutout")
+
+        inputs = {"body": base.Shape, "tolerance": getattr(fp, "FuzzyTolerance", 0.0)}
+        for trim in reversed(chain):
+            for key, value in self.get_cut_tools(trim).items():
+                inputs.setdefault(key, []).extend(value)
+
+        # only the faces of the boundaries around the trimmed ends are inputs, a change far from the joint doesn't matter
+        inputs["boundaries"] = local_boundaries(
+            inputs["body"], inputs["boundaries"], self.get_boundary_regions(chain, base)
+        )
+
+        return inputs
+
+    def get_boundary_regions(self, chain, base):
+        """
+        Return, for each boundary of the chain (in the order of get_cut_tools), the bounding boxes around the ends of
+        the Target edge of 'base' the boundary can reach: the end point enlarged by the section of the body, its
+        offsets and the section of the boundary. None when one of the sections isn't known.
+        """
+        axis = member_axis(base)
+        body_reach = section_reach(base)
+
+        regions = []
+        for trim in reversed(chain):
+            if trim.TrimmedProfileType != "End Trim" or trim.CutType not in ["Perfect fit", "Coped cut"]:
+                continue
+
+            for link in trim.TrimmingBoundary:
+                boundary_reach = section_reach(link[0])
+                if axis is None or body_reach is None or boundary_reach is None:
+                    regions.append(None)
+                    continue
+
+                size = body_reach + boundary_reach + BOUNDARY_MARGIN
+                regions.append(
+                    [App.BoundBox(p.x - size, p.y - size, p.z - size, p.x + size, p.y + size, p.z + size) for p in axis]
+                )
+
+        return regions
+
+    def get_cut_tools(self, fp):
+        """Return the cut tools of this trim only, as lists of cuts.trim_shape arguments."""
+        tools = {"boundaries": [], "faces": [], "miter_planes": [], "copes": []}
 
         if fp.TrimmedProfileType == "End Trim":
             if fp.CutType in ["Perfect fit", "Coped cut"]:  # Keeping Coped cut for retro-compatibility
-                shapes = [x[0].Shape for x in fp.TrimmingBoundary]
-                shps = BOPTools.SplitAPI.slice(fp.TrimmedBody.Shape, shapes, mode="Split")
-                for solid in shps.Solids:
-                    x = fp.TrimmedBody.Shape.CenterOfGravity.x
-                    y = fp.TrimmedBody.Shape.CenterOfGravity.y
-                    z = fp.TrimmedBody.Shape.CenterOfGravity.z
-                    if not solid.BoundBox.isInside(x, y, z):
-                        cut_shapes.append(Part.Shape(solid))
+                tools["boundaries"] += [x[0].Shape for x in fp.TrimmingBoundary]
 
             elif fp.CutType in ["Simple fit", "Simple cut"]:  # Keeping Simple cut for retro-compatibility
-                cut_shape = Part.Shape()
+                faces = []
                 for link in fp.TrimmingBoundary:
                     part = link[0]
                     for sub in link[1]:
                         face = part.getSubObject(sub)
                         if isinstance(face.Surface, Part.Plane):
-                            shp = self.getOutsideCV(face, fp.TrimmedBody.Shape)
-                            cut_shapes.append(shp)
+                            faces.append(face)
+                tools["faces"] += faces
+
+            elif fp.CutType == "Tube cope":
+                tube = largest_cylinder(fp.TrimmedBody.Shape)
+                if tube is None:
+                    raise RuntimeError("Tube cope: the trimmed body is not round")
+                for link in fp.TrimmingBoundary:
+                    other = largest_cylinder(link[0].Shape)
+                    if other is None:
+                        raise RuntimeError(f"Tube cope: {link[0].Label} is not round")
+                    # the half-space beyond the axis of the other tube is removed too
+                    normal = tube.Axis - other.Axis * tube.Axis.dot(other.Axis)
+                    if normal.Length < 1e-9:
+                        raise RuntimeError(f"Tube cope: {link[0].Label} is parallel to the trimmed body")
+                    tools["copes"].append((other.Center, other.Axis, other.Radius, normal))
 
         elif fp.TrimmedProfileType == "End Miter":
             doc = App.activeDocument()
-            precision = 0.001
             target1 = self.getTarget(fp.TrimmedBody)
             edge1 = doc.getObject(target1[0].Name).getSubObject(target1[1][0])
-            bounds_target = []
             for bound in fp.TrimmingBoundary:
-                bounds_target.append(self.getTarget(bound[0]))
-            trimming_boundary_edges = []
-            for target in bounds_target:
-                trimming_boundary_edges.append(doc.getObject(target[0].Name).getSubObject(target[1][0]))
-            for edge2 in trimming_boundary_edges:
-                end1 = edge1.Vertexes[-1].Point
-                start1 = edge1.Vertexes[0].Point
-                end2 = edge2.Vertexes[-1].Point
-                start2 = edge2.Vertexes[0].Point
-                vec1 = start1.sub(end1)
-                vec2 = start2.sub(end2)
-
-                angle = math.degrees(vec1.getAngle(vec2))
-
-                if end1.distanceToPoint(start2) < precision or start1.distanceToPoint(end2) < precision:
-                    angle = 180 - angle
-
-                bisect = angle / 2.0
-
-                if start1.distanceToPoint(start2) < precision:
-                    p1 = start1
-                    p2 = end1
-                    p3 = end2
-                elif start1.distanceToPoint(end2) < precision:
-                    p1 = start1
-                    p2 = end1
-                    p3 = start2
-                elif end1.distanceToPoint(start2) < precision:
-                    p1 = end1
-                    p2 = start1
-                    p3 = end2
-                elif end1.distanceToPoint(end2) < precision:
-                    p1 = end1
-                    p2 = start1
-                    p3 = start2
-                else:
-                    raise RuntimeError("End Miter: edges not aligned. Ensure they meet at a common endpoint.")
-
-                normal = Part.Plane(p1, p2, p3).toShape().normalAt(0, 0)
-                cutplane = Part.makePlane(10, 10, p1, vec1, normal)
-                cutplane.rotate(p1, normal, -90 + bisect)
-                cut_shapes.append(self.getOutsideCV(cutplane, fp.TrimmedBody.Shape))
-
-        if len(cut_shapes) > 0:
-            cut_shape = Part.Shape(cut_shapes[0])
-            for sh in cut_shapes[1:]:
-                cut_shape = cut_shape.fuse(sh)
-
-        self.makeShape(fp, cut_shape)
-
-    def getOutsideCV(self, cutplane, shape):
-        cv = ArchCommands.getCutVolume(cutplane, shape, clip=False, depth=0.0)
-        if cv[1].isInside(shape.CenterOfGravity, 0.001, False):
-            cv = cv[2]
-        else:
-            cv = cv[1]
-        return cv
+                target2 = self.getTarget(bound[0])
+                edge2 = doc.getObject(target2[0].Name).getSubObject(target2[1][0])
+                tools["miter_planes"].append(miter_plane(edge1, edge2))
 
-    def makeShape(self, fp, cutshape):
-        if not cutshape.isNull():
-            fp.Shape = fp.TrimmedBody.Shape.cut(cutshape)
+        return tools
+
+    def apply_shape(self, fp, shape):
+        """Assign the result of cuts.trim_shape."""
+        if shape is not None:
+            fp.Shape = shape
         else:
-            # TODO: Do something when cutshape is Null
-            print("cut_shape is Null")
+            App.Console.PrintError(f"{fp.Label}: the trimming boundaries cut nothing, the shape is unchanged\n")
+
+        self.export_cope_template(fp)
+
+    def run_compatibility_migrations(self, fp):
+        # add FuzzyTolerance (<= 0.1.7)
+        if not hasattr(fp, "FuzzyTolerance"):
+            App.Console.PrintMessage(f"Frameforge::object migration : adding FuzzyTolerance to {fp.Label}\n")
+            self.add_fuzzy_tolerance(fp)
+
+        # add Tube cope (<= 0.1.7)
+        if "Tube cope" not in fp.getEnumerationsOfProperty("CutType"):
+            cut_type = fp.CutType
+            fp.CutType = CUT_TYPES + [c for c in fp.getEnumerationsOfProperty("CutType") if c not in CUT_TYPES]
+            fp.CutType = cut_type
+        if not hasattr(fp, "CopeTemplate"):
+            self.add_cope_template(fp)
+
+    def export_cope_template(self, fp):
+        """Write the Tube cope template to the CopeTemplate file, if set."""
+        if not getattr(fp, "CopeTemplate", "") or fp.CutType != "Tube cope" or fp.TrimmedBody is None:
+            return
+
+        tube = largest_cylinder(fp.TrimmedBody.Shape)
+        for link in fp.TrimmingBoundary:
+            other = largest_cylinder(link[0].Shape)
+            if tube is None or other is None:
+                App.Console.PrintError(f"{fp.Label}: can't write the cope template of members that aren't round\n")
+                return
+            path = fp.CopeTemplate
+            if len(fp.TrimmingBoundary) > 1:
+                root, ext = os.path.splitext(path)
+                path = f"{root}_{link[0].Name}{ext}"
+            try:
+                export_template(path, tube.Radius, other.Radius, axes_angle(tube.Axis, other.Axis))
+            except (OSError, ValueError) as e:
+                App.Console.PrintError(f"{fp.Label}: can't write the cope template ({e})\n")
 
     def getTarget(self, link):
         while True: